@@ -8,7 +8,7 @@ from utils.ui_components import header_with_logo, step_progress, concept_card, m
 from utils.graph_viz import display_knowledge_graph, simplified_graph_viz  # Include simplified as fallback
 from utils.state import init_session_state, get_state, set_state
 from utils.demo_data import load_applicant_data, generate_all_data
-from utils.kg_generator import get_graph_for_stage
+from utils.kg_generator import get_graph_for_stage, STAGE_TO_INDEX
 
 # Set up page config and theme
 setup_page_config()
@@ -86,15 +86,7 @@ step_progress(journey_stages, current_stage_idx)
 st.header(f"Stage: {current_stage}")
 
 # For demo purposes, map stages to data points
-stage_to_index = {
-    "Initial Application": 0,
-    "Information Gathering": 2,
-    "Risk Assessment": 5,
-    "Decision Point": 8,
-    "Monitoring Phase": 11
-}
-
-current_index = min(stage_to_index.get(current_stage, 0), len(financial_data) - 1)
+current_index = min(STAGE_TO_INDEX.get(current_stage, 0), len(financial_data) - 1)
 
 # Create columns for key metrics
 st.subheader("Key Metrics")
@@ -142,7 +134,7 @@ if debug_mode:
     st.write(f"Graph contains {len(G.nodes)} nodes and {len(G.edges)} edges.")
 
 # Get the appropriate graph for the current stage
-G = get_graph_for_stage(applicant_data, current_stage, stage_to_index)
+G = get_graph_for_stage(applicant_data, current_stage, STAGE_TO_INDEX)
 
 # Display the graph with NetworkX
 try:
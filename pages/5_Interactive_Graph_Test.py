@@ -1,6 +1,8 @@
 # pages/4_Interactive_Graph_Test.py
 import streamlit as st
 import networkx as nx
+import json
+from importlib.util import find_spec
 from utils.theme import setup_page_config, apply_theme, COLORS
 from utils.demo_data import load_applicant_data, generate_all_data
 from utils.kg_generator import create_initial_knowledge_graph, create_expanded_knowledge_graph
@@ -8,25 +10,122 @@ from utils.kg_generator import create_initial_knowledge_graph, create_expanded_k
 # Import visualization libraries - handle import errors gracefully
 st.set_page_config(page_title="Interactive Graph Test", layout="wide")
 
-# Try to import the required libraries
-agraph_available = False
-pyvis_available = False
+# Check which libraries are installed without importing them; each is loaded
+# only when its visualization is selected
+agraph_available = find_spec("streamlit_agraph") is not None
+pyvis_available = find_spec("pyvis") is not None
 
-try:
-    from streamlit_agraph import agraph, Node, Edge, Config
-    agraph_available = True
-except ImportError:
+if not agraph_available:
     st.warning("Streamlit-Agraph not available. Only PyVis will be tested.")
 
-try:
-    from pyvis.network import Network
-    import streamlit.components.v1 as components
-    import tempfile
-    import os
-    pyvis_available = True
-except ImportError:
+if not pyvis_available:
     st.warning("PyVis not available. Only Agraph will be tested.")
 
+@st.cache_resource
+def get_agraph():
+    """Import and return the Streamlit-Agraph component and its classes."""
+    from streamlit_agraph import agraph, Node, Edge, Config
+    return agraph, Node, Edge, Config
+
+@st.cache_resource
+def get_pyvis_network():
+    """Import and return the PyVis Network class."""
+    from pyvis.network import Network
+    return Network
+
+@st.cache_resource
+def build_test_graph(company):
+    """Build the test knowledge graph once per company profile."""
+    return create_initial_knowledge_graph(company)
+
+@st.cache_data(max_entries=16)
+def build_pyvis_html(nodes, edges, bgcolor, font_color, theta=0.5, show_controls=False):
+    """Generate the PyVis HTML for the given node and edge tuples, in memory."""
+    Network = get_pyvis_network()
+    net = Network(height="600px", width="100%", bgcolor=bgcolor, font_color=font_color)
+    
+    # Add nodes with properties
+    for node_id, size, color, title, shape in nodes:
+        net.add_node(node_id, title=title, color=color, size=size, shape=shape, label=node_id)
+    
+    # Add edges with properties
+    for source, target, width, color, title in edges:
+        net.add_edge(source, target, width=width, color=color, title=title)
+    
+    # Configure physics with Barnes-Hut, whose quadtree approximation keeps repulsion
+    # at O(n log n); higher theta trades layout accuracy for speed
+    net.barnes_hut(gravity=-2000, central_gravity=0.3, spring_length=200, 
+                   spring_strength=0.05, damping=0.2, overlap=0)
+    net.options.physics.barnesHut.theta = theta
+    
+    # The physics control panel keeps the solver running, so it is opt-in
+    if show_controls:
+        net.show_buttons(['physics'])
+    else:
+        net.options.physics.stabilization.iterations = 50
+        net.options.physics.minVelocity = 0.75
+    
+    return net.generate_html(notebook=False)
+
+# Node count above which the WebGL renderer is selected by default
+WEBGL_NODE_THRESHOLD = 200
+
+# Sigma.js page template; the graph JSON and colors are substituted in before rendering
+SIGMA_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<script src="https://cdn.jsdelivr.net/npm/graphology@0.25.4/dist/graphology.umd.min.js"></script>
+<script src="https://cdn.jsdelivr.net/npm/sigma@2.4.0/build/sigma.min.js"></script>
+</head>
+<body style="margin: 0; background: __BGCOLOR__;">
+<div id="container" style="width: 100%; height: 600px;"></div>
+<script>
+const data = __GRAPH_JSON__;
+const graph = new graphology.Graph();
+data.nodes.forEach(n => graph.addNode(n.id, {x: n.x, y: n.y, size: n.size, color: n.color, label: n.id}));
+data.links.forEach(e => graph.mergeEdge(e.source, e.target, {size: e.width, color: e.color}));
+new Sigma(graph, document.getElementById("container"), {
+    labelColor: {color: "__FONT_COLOR__"},
+    renderEdgeLabels: false,
+    enableEdgeClickEvents: false,
+    enableEdgeWheelEvents: false,
+    enableEdgeHoverEvents: false
+});
+</script>
+</body>
+</html>"""
+
+@st.cache_data(max_entries=16)
+def build_sigma_html(nodes, edges, bgcolor, font_color):
+    """Generate a sigma.js WebGL page for the given node and edge tuples."""
+    G = nx.Graph()
+    G.add_nodes_from(
+        (node_id, {"size": size / 3, "color": color})
+        for node_id, size, color, _, _ in nodes
+    )
+    G.add_edges_from(
+        (source, target, {"width": width, "color": color})
+        for source, target, width, color, _ in edges
+    )
+    
+    # Sigma does no layout of its own, so positions are computed once here
+    pos = nx.spring_layout(G, seed=42)
+    nx.set_node_attributes(G, {node: {"x": float(x), "y": float(y)} for node, (x, y) in pos.items()})
+    
+    graph_data = nx.node_link_data(G, edges="links")
+    if find_spec("orjson") is not None:
+        import orjson
+        graph_json = orjson.dumps(graph_data, option=orjson.OPT_SERIALIZE_NUMPY).decode("utf-8")
+    else:
+        graph_json = json.dumps(graph_data)
+    
+    # Escape "</" so a label containing "</script>" cannot close the script block
+    graph_json = graph_json.replace("</", "<\\/")
+    return (SIGMA_TEMPLATE
+            .replace("__GRAPH_JSON__", graph_json)
+            .replace("__BGCOLOR__", bgcolor)
+            .replace("__FONT_COLOR__", font_color))
+
 # Header
 st.title("Interactive Knowledge Graph Test")
 st.subheader("Testing different interactive graph visualization options")
@@ -40,7 +139,7 @@ try:
         applicant_data = load_applicant_data("strong_applicant")
     
     company = applicant_data["company_profile"]
-    G = create_initial_knowledge_graph(company)
+    G = build_test_graph(company)
     
     # Let user choose which visualization to test
     viz_options = []
@@ -59,40 +158,25 @@ try:
     st.subheader(f"Testing {viz_choice}")
     
     if viz_choice == "Agraph" and agraph_available:
-        # Convert NetworkX graph to Agraph nodes and edges
-        nodes = []
-        edges = []
+        agraph, Node, Edge, Config = get_agraph()
         
-        # Process nodes
-        for node, attrs in G.nodes(data=True):
-            # Get attributes with defaults
-            size = attrs.get('size', 25)
-            color = attrs.get('color', COLORS['node_default'])
-            title = attrs.get('title', str(node))
-            
-            # Create node
-            nodes.append(Node(
-                id=str(node),
-                label=str(node),
-                size=size,
-                color=color,
-                title=title
-            ))
+        # Convert NetworkX graph to Agraph nodes and edges
+        nodes = [
+            Node(id=str(node),
+                 label=str(node),
+                 size=attrs.get('size', 25),
+                 color=attrs.get('color', COLORS['node_default']),
+                 title=attrs.get('title', str(node)))
+            for node, attrs in G.nodes.items()
+        ]
         
-        # Process edges
-        for source, target, attrs in G.edges(data=True):
-            # Get attributes with defaults
-            width = attrs.get('width', 1)
-            color = attrs.get('color', COLORS['edge_default'])
-            title = attrs.get('title', '')
-            
-            # Create edge
-            edges.append(Edge(
-                source=str(source),
-                target=str(target),
-                label=title if title else None,
-                color=color
-            ))
+        edges = [
+            Edge(source=str(source),
+                 target=str(target),
+                 label=attrs.get('title') or None,
+                 color=attrs.get('color', COLORS['edge_default']))
+            for source, target, attrs in G.edges(data=True)
+        ]
         
         # Create configuration
         config = Config(
@@ -115,47 +199,39 @@ try:
         st.success("Agraph visualization successful!")
     
     elif viz_choice == "PyVis" and pyvis_available:
-        # Create PyVis network
-        net = Network(height="600px", width="100%", bgcolor=COLORS['bg_dark'], 
-                     font_color=COLORS['text_primary'])
-        
-        # Add nodes with properties
-        for node, node_attrs in G.nodes(data=True):
-            size = node_attrs.get('size', 25)
-            title = node_attrs.get('title', str(node))
-            color = node_attrs.get('color', COLORS['node_default'])
-            shape = node_attrs.get('shape', 'dot')
-            
-            net.add_node(str(node), title=title, color=color, size=size, shape=shape, label=str(node))
-        
-        # Add edges with properties
-        for source, target, edge_attrs in G.edges(data=True):
-            width = edge_attrs.get('width', 1)
-            color = edge_attrs.get('color', COLORS['edge_default'])
-            title = edge_attrs.get('title', '')
-            
-            net.add_edge(str(source), str(target), width=width, color=color, title=title)
-        
-        # Configure physics
-        net.force_atlas_2based(spring_length=200, spring_strength=0.05, damping=0.2)
-        net.show_buttons(['physics'])
-        
-        # Generate HTML file
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.html') as temp:
-            path = temp.name
-            net.save_graph(path)
+        # Describe the graph as hashable tuples so the HTML can be cached
+        nodes = tuple(
+            (str(node),
+             node_attrs.get('size', 25),
+             node_attrs.get('color', COLORS['node_default']),
+             node_attrs.get('title', str(node)),
+             node_attrs.get('shape', 'dot'))
+            for node, node_attrs in G.nodes(data=True)
+        )
+        edges = tuple(
+            (str(source),
+             str(target),
+             edge_attrs.get('width', 1),
+             edge_attrs.get('color', COLORS['edge_default']),
+             edge_attrs.get('title', ''))
+            for source, target, edge_attrs in G.edges(data=True)
+        )
         
-        # Read HTML content
-        with open(path, 'r', encoding='utf-8') as f:
-            html = f.read()
+        # WebGL batches drawing on the GPU, which scales past what SVG/canvas handles
+        renderer = st.radio("Renderer:", ["SVG", "WebGL"], horizontal=True,
+                            index=1 if len(G) > WEBGL_NODE_THRESHOLD else 0)
         
-        # Clean up the temporary file
-        try:
-            os.unlink(path)
-        except:
-            pass
+        if renderer == "WebGL":
+            html = build_sigma_html(nodes, edges, COLORS['bg_dark'], COLORS['text_primary'])
+        else:
+            theta = st.slider("Barnes-Hut theta (higher is faster, less accurate):", 
+                              min_value=0.1, max_value=1.0, value=0.5, step=0.1)
+            show_controls = st.checkbox("Show physics controls")
+            html = build_pyvis_html(nodes, edges, COLORS['bg_dark'], COLORS['text_primary'], 
+                                    theta, show_controls)
         
         # Display the interactive graph
+        import streamlit.components.v1 as components
         st.write("Try dragging nodes, zooming, and interacting with the graph:")
         components.html(html, height=600)
         
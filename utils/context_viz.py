@@ -1,60 +1,82 @@
 # utils/context_viz.py
 import streamlit as st
 import pandas as pd
+import numpy as np
 import networkx as nx
-import plotly.graph_objects as go
-from utils.theme import COLORS
-from utils.graph_viz import create_pyvis_graph
+from utils.theme import COLORS, dark_layout_template
+import streamlit.components.v1 as components
+from utils.graph_viz import pyvis_html_from_lists
 
-def create_context_integration_graph(entity_name, context_sources=None, complexity=2):
-    """Create a graph showing external context integration."""
-    G = nx.Graph()
+# Static metadata for each external context source
+SOURCE_META = {
+    "Industry Trends": {
+        "color": COLORS['external'],
+        "subnodes": ("Growth Rate", "Technology Adoption", "Market Size"),
+        "reliability": 0.85,
+        "impact": 0.15
+    },
+    "Competitive Landscape": {
+        "color": COLORS['external'],
+        "subnodes": ("Competitor A", "Competitor B", "Market Leader"),
+        "reliability": 0.78,
+        "impact": -0.12
+    },
+    "Economic Indicators": {
+        "color": COLORS['external'],
+        "subnodes": ("Interest Rates", "Inflation", "GDP Growth"),
+        "reliability": 0.92,
+        "impact": -0.08
+    },
+    "Regulatory Environment": {
+        "color": COLORS['external'],
+        "subnodes": ("Compliance Changes", "Industry Standards", "Tax Policy"),
+        "reliability": 0.81,
+        "impact": -0.05
+    }
+}
+
+# Sources active by default
+DEFAULT_ACTIVE_SOURCES = ("Industry Trends", "Competitive Landscape")
+
+@st.cache_data(ttl="10m", max_entries=64)
+def build_context_nodes_edges(entity_name, active_sources, complexity=2, aggregate=False):
+    """
+    Build PyVis-ready node and edge tuples from a hashable description of active sources.
     
-    # Add main entity node
-    G.add_node(entity_name, size=30, color=COLORS['digital_twin'], 
-               title=entity_name, shape='dot')
+    Args:
+        entity_name: Name of the main entity node
+        active_sources: Tuple of (source, color, subnodes) tuples for active sources
+        complexity: 1 = sources only, 2 = add subnodes, 3 = add cross-connections
+        aggregate: If True, collapse each source's subnodes into one summary node
+            and skip cross-connections
+        
+    Returns:
+        Tuple of (nodes, edges), where nodes are (id, size, color, title, shape)
+        tuples and edges are (source, target, width, color, title) tuples, with a
+        trailing dashes flag on the dashed cross-connection edges
+    """
+    # Bind colors used inside the loops to locals
+    edge_color = COLORS['edge_default']
     
-    # Default context sources if not provided
-    if context_sources is None:
-        context_sources = {
-            "Industry Trends": {
-                "active": True, 
-                "color": COLORS['external'],
-                "subnodes": ["Growth Rate", "Technology Adoption", "Market Size"]
-            },
-            "Competitive Landscape": {
-                "active": True, 
-                "color": COLORS['external'],
-                "subnodes": ["Competitor A", "Competitor B", "Market Leader"]
-            },
-            "Economic Indicators": {
-                "active": False, 
-                "color": COLORS['external'],
-                "subnodes": ["Interest Rates", "Inflation", "GDP Growth"]
-            },
-            "Regulatory Environment": {
-                "active": False, 
-                "color": COLORS['external'],
-                "subnodes": ["Compliance Changes", "Industry Standards", "Tax Policy"]
-            }
-        }
+    nodes = [(entity_name, 30, COLORS['digital_twin'], entity_name, 'dot')]
+    edges = []
     
     # Add context source nodes
-    for source, attrs in context_sources.items():
-        if attrs.get("active", False):
-            G.add_node(source, size=20, color=attrs.get("color", COLORS['external']), 
-                      title=source, shape='dot')
-            G.add_edge(entity_name, source, width=2, color=COLORS['edge_default'])
-            
-            # Add subnodes for higher complexity
-            if complexity >= 2 and "subnodes" in attrs:
-                for subnode in attrs["subnodes"]:
-                    G.add_node(subnode, size=10, color=attrs.get("color", COLORS['external']), 
-                              title=subnode, shape='dot')
-                    G.add_edge(source, subnode, width=1, color=COLORS['edge_default'])
+    for source, color, subnodes in active_sources:
+        nodes.append((source, 20, color, source, 'dot'))
+        edges.append((entity_name, source, 2, edge_color, ''))
+        
+        # Add subnodes for higher complexity
+        if complexity >= 2 and aggregate:
+            summary = f"{source} ({len(subnodes)} factors)"
+            nodes.append((summary, 15, color, ", ".join(subnodes), 'dot'))
+            edges.append((source, summary, 1, edge_color, ''))
+        elif complexity >= 2:
+            nodes.extend((subnode, 10, color, subnode, 'dot') for subnode in subnodes)
+            edges.extend((source, subnode, 1, edge_color, '') for subnode in subnodes)
     
     # Add cross-connections for highest complexity
-    if complexity >= 3:
+    if complexity >= 3 and not aggregate:
         # Connect some subnodes that would be related
         cross_connections = [
             ("Growth Rate", "Competitor A"),
@@ -63,104 +85,162 @@ def create_context_integration_graph(entity_name, context_sources=None, complexi
             ("Interest Rates", "Market Size")
         ]
         
-        for source, target in cross_connections:
-            if source in G.nodes and target in G.nodes:
-                G.add_edge(source, target, width=1, color=COLORS['edge_default'], 
-                          style='dashed')
+        # Keep only pairs whose endpoints are both present; cross-connections are dashed
+        node_names = {node[0] for node in nodes}
+        edges.extend((source, target, 1, edge_color, '', True) 
+                     for source, target in cross_connections
+                     if source in node_names and target in node_names)
+    
+    return tuple(nodes), tuple(edges)
+
+def build_context_integration_graph(entity_name, active_sources, complexity=2, aggregate=False):
+    """
+    Build the context integration graph as a NetworkX graph.
+    
+    Only needed by callers that run graph algorithms; rendering can use the
+    tuples from build_context_nodes_edges directly.
+    
+    Returns:
+        NetworkX graph object
+    """
+    nodes, edges = build_context_nodes_edges(entity_name, active_sources, complexity, aggregate)
+    
+    G = nx.Graph()
+    G.add_nodes_from(
+        (node_id, {"size": size, "color": color, "title": title, "shape": shape})
+        for node_id, size, color, title, shape in nodes
+    )
+    G.add_edges_from(
+        (source, target, {"width": width, "color": color, **({"style": "dashed"} if dashes else {})})
+        for source, target, width, color, _, *dashes in edges
+    )
     
     return G
 
-def context_impact_visualization(context_impacts, height=400):
-    """Create a visualization of context impact on risk assessment."""
-    # Create figure
-    fig = go.Figure()
-    
-    # Add bars for impacts
-    for context, impact in context_impacts.items():
-        # Determine color based on impact
-        if impact > 0:
-            color = COLORS['high_confidence']  # Positive impact
-        else:
-            color = COLORS['low_confidence']   # Negative impact
-        
-        # Add bar
-        fig.add_trace(go.Bar(
-            x=[impact],
-            y=[context],
-            orientation='h',
-            marker_color=color,
-            name=context,
-            hovertemplate='<b>%{y}</b><br>Impact: %{x:.2f}'
-        ))
+def create_context_integration_graph(entity_name, context_sources=None, complexity=2, max_nodes=40,
+                                     as_graph=True):
+    """Create a graph showing external context integration.
+    
+    Falls back to an aggregated view with one summary node per source when the
+    full graph would exceed max_nodes. Returns (graph, aggregate), where aggregate
+    tells whether that fallback was used; with as_graph=False, graph is the
+    (nodes, edges) tuples instead of a NetworkX graph."""
+    # Default context sources if not provided
+    if context_sources is None:
+        context_sources = {
+            source: {**meta, "active": source in DEFAULT_ACTIVE_SOURCES}
+            for source, meta in SOURCE_META.items()
+        }
+    
+    # Reduce the sources to a hashable key so the graph build can be cached
+    default_color = COLORS['external']
+    active_sources = tuple(
+        (source, attrs.get("color", default_color), tuple(attrs.get("subnodes", ())))
+        for source, attrs in context_sources.items()
+        if attrs.get("active", False)
+    )
+    
+    # Level-of-detail fallback: keep the rendered graph bounded
+    projected_nodes = 1 + len(active_sources)
+    if complexity >= 2:
+        projected_nodes += sum(len(subnodes) for _, _, subnodes in active_sources)
+    aggregate = projected_nodes > max_nodes
+    
+    if not as_graph:
+        return build_context_nodes_edges(entity_name, active_sources, complexity, aggregate), aggregate
+    return build_context_integration_graph(entity_name, active_sources, complexity, aggregate), aggregate
+
+@st.cache_data(max_entries=32)
+def build_context_impact_figure(impact_items, height=400):
+    """Build the context impact figure from a tuple of (source, impact) pairs."""
+    import plotly.graph_objects as go
+    
+    contexts = np.array([context for context, _ in impact_items])
+    impacts = np.array([impact for _, impact in impact_items], dtype=np.float32)
+    
+    # Positive impacts are green, negative impacts red
+    colors = np.where(impacts > 0, COLORS['high_confidence'], COLORS['low_confidence'])
+    
+    # Create figure with a single trace holding every bar
+    fig = go.Figure(go.Bar(
+        x=impacts,
+        y=contexts,
+        orientation='h',
+        marker_color=colors,
+        hovertemplate='<b>%{y}</b><br>Impact: %{x:.2f}<extra></extra>'
+    ))
     
     # Update layout for dark theme
     fig.update_layout(
-        paper_bgcolor=COLORS['bg_dark'],
-        plot_bgcolor=COLORS['bg_dark'],
-        font_color=COLORS['text_primary'],
+        template=dark_layout_template(),
         title="External Context Impact on Risk Assessment",
         xaxis_title="Impact (negative = higher risk)",
         yaxis_title="Context Source",
         height=height,
         xaxis=dict(
-            gridcolor=COLORS['bg_light'],
             zeroline=True,
             zerolinecolor=COLORS['text_secondary']
-        ),
-        yaxis=dict(
-            gridcolor=COLORS['bg_light']
         )
     )
     
     return fig
 
-def context_source_reliability(sources, height=300):
-    """Create a visualization of source reliability."""
-    # Create figure
-    fig = go.Figure()
+def context_impact_visualization(context_impacts, height=400):
+    """Create a visualization of context impact on risk assessment."""
+    return build_context_impact_figure(tuple(context_impacts.items()), height)
+
+@st.cache_data(max_entries=32)
+def build_source_reliability_figure(reliability_items, height=300):
+    """Build the source reliability figure from a tuple of (source, reliability) pairs."""
+    import plotly.graph_objects as go
     
-    # Add bars for source reliability
-    for source, reliability in sources.items():
-        # Determine color based on reliability
+    sources = [source for source, _ in reliability_items]
+    reliabilities = [reliability for _, reliability in reliability_items]
+    
+    # Determine color based on reliability
+    high, medium, low = COLORS['high_confidence'], COLORS['medium_confidence'], COLORS['low_confidence']
+    colors = []
+    for reliability in reliabilities:
         if reliability >= 0.8:
-            color = COLORS['high_confidence']
+            colors.append(high)
         elif reliability >= 0.5:
-            color = COLORS['medium_confidence']
+            colors.append(medium)
         else:
-            color = COLORS['low_confidence']
-        
-        # Add bar
-        fig.add_trace(go.Bar(
-            x=[reliability],
-            y=[source],
-            orientation='h',
-            marker_color=color,
-            name=source,
-            hovertemplate='<b>%{y}</b><br>Reliability: %{x:.2f}'
-        ))
+            colors.append(low)
+    
+    # Create figure with a single trace holding every bar
+    fig = go.Figure(go.Bar(
+        x=reliabilities,
+        y=sources,
+        orientation='h',
+        marker_color=colors,
+        hovertemplate='<b>%{y}</b><br>Reliability: %{x:.2f}<extra></extra>'
+    ))
     
     # Update layout for dark theme
     fig.update_layout(
-        paper_bgcolor=COLORS['bg_dark'],
-        plot_bgcolor=COLORS['bg_dark'],
-        font_color=COLORS['text_primary'],
+        template=dark_layout_template(),
         title="Source Reliability Assessment",
         xaxis_title="Reliability Score",
         yaxis_title="Information Source",
         height=height,
         xaxis=dict(
-            gridcolor=COLORS['bg_light'],
             range=[0, 1]
-        ),
-        yaxis=dict(
-            gridcolor=COLORS['bg_light']
         )
     )
     
     return fig
 
+def context_source_reliability(sources, height=300):
+    """Create a visualization of source reliability."""
+    return build_source_reliability_figure(tuple(sources.items()), height)
+
+@st.fragment
 def context_integration_demo():
-    """Create a complete context integration demonstration."""
+    """Create a complete context integration demonstration.
+    
+    Runs as a fragment, whose return value Streamlit discards on fragment reruns, so
+    the active sources are kept in st.session_state["context_active_sources"] instead."""
     st.write("### External Context Integration")
     
     st.write("""
@@ -178,64 +258,49 @@ def context_integration_demo():
     # Context source selection
     st.write("#### Toggle External Context Sources")
     
-    col1, col2 = st.columns(2)
+    # A single multiselect emits one state change per interaction
+    selected = st.multiselect(
+        "External Context Sources",
+        options=list(SOURCE_META.keys()),
+        default=list(DEFAULT_ACTIVE_SOURCES)
+    )
     
-    context_sources = {}
+    context_sources = {
+        source: {**meta, "active": source in selected}
+        for source, meta in SOURCE_META.items()
+    }
     
-    with col1:
-        context_sources["Industry Trends"] = {
-            "active": st.checkbox("Industry Trends", value=True),
-            "color": COLORS['external'],
-            "subnodes": ["Growth Rate", "Technology Adoption", "Market Size"],
-            "reliability": 0.85,
-            "impact": 0.15
-        }
-        
-        context_sources["Competitive Landscape"] = {
-            "active": st.checkbox("Competitive Landscape", value=True),
-            "color": COLORS['external'],
-            "subnodes": ["Competitor A", "Competitor B", "Market Leader"],
-            "reliability": 0.78,
-            "impact": -0.12
-        }
+    # Only show impact analysis if there are active sources
+    active_sources = {k: v for k, v in context_sources.items() if v.get("active", False)}
+    st.session_state["context_active_sources"] = active_sources
     
-    with col2:
-        context_sources["Economic Indicators"] = {
-            "active": st.checkbox("Economic Indicators", value=False),
-            "color": COLORS['external'],
-            "subnodes": ["Interest Rates", "Inflation", "GDP Growth"],
-            "reliability": 0.92,
-            "impact": -0.08
-        }
-        
-        context_sources["Regulatory Environment"] = {
-            "active": st.checkbox("Regulatory Environment", value=False),
-            "color": COLORS['external'],
-            "subnodes": ["Compliance Changes", "Industry Standards", "Tax Policy"],
-            "reliability": 0.81,
-            "impact": -0.05
-        }
+    # Rebuild the graph and charts only when the entity or source selection changed
+    state_hash = hash((entity, tuple(sorted((k, v["active"]) for k, v in context_sources.items()))))
+    if st.session_state.get("last_ctx_hash") != state_hash:
+        (nodes, edges), aggregate = create_context_integration_graph(entity, context_sources, as_graph=False)
+        st.session_state["last_pyvis_html"] = pyvis_html_from_lists(nodes, edges, height=400)
+        st.session_state["last_ctx_aggregate"] = aggregate
+        if active_sources:
+            source_reliability = {k: v.get("reliability", 0.5) for k, v in active_sources.items()}
+            context_impacts = {k: v.get("impact", 0) for k, v in active_sources.items()}
+            st.session_state["last_reliability_fig"] = context_source_reliability(source_reliability)
+            st.session_state["last_impact_fig"] = context_impact_visualization(context_impacts)
+        st.session_state["last_ctx_hash"] = state_hash
     
     # Create and display knowledge graph
     st.write("#### External Context Network")
-    G = create_context_integration_graph(entity, context_sources)
-    create_pyvis_graph(G, height=400)
-    
-    # Only show impact analysis if there are active sources
-    active_sources = {k: v for k, v in context_sources.items() if v.get("active", False)}
+    if st.session_state["last_ctx_aggregate"]:
+        st.caption("Showing aggregated view for performance.")
+    components.html(st.session_state["last_pyvis_html"], height=400)
     
     if active_sources:
         # Source reliability visualization
         st.write("#### Source Reliability")
-        source_reliability = {k: v.get("reliability", 0.5) for k, v in active_sources.items()}
-        reliability_fig = context_source_reliability(source_reliability)
-        st.plotly_chart(reliability_fig, use_container_width=True)
+        st.plotly_chart(st.session_state["last_reliability_fig"], use_container_width=True, theme=None)
         
         # Context impact visualization
         st.write("#### Impact on Risk Assessment")
-        context_impacts = {k: v.get("impact", 0) for k, v in active_sources.items()}
-        impact_fig = context_impact_visualization(context_impacts)
-        st.plotly_chart(impact_fig, use_container_width=True)
+        st.plotly_chart(st.session_state["last_impact_fig"], use_container_width=True, theme=None)
         
         # Show risk adjustment
         st.write("#### Risk Assessment Adjustment")
@@ -247,8 +312,10 @@ def context_integration_demo():
         
         with col2:
             # Calculate adjusted score based on active sources
-            adjustment = sum(v.get("impact", 0) for v in active_sources.values())
-            new_score = max(0.05, min(0.95, 0.45 + adjustment))
+            impacts = np.fromiter((v.get("impact", 0.0) for v in active_sources.values()),
+                                  dtype=np.float32, count=len(active_sources))
+            adjustment = float(impacts.sum())
+            new_score = float(np.clip(0.45 + adjustment, 0.05, 0.95))
             
             risk_level = "Medium"
             if new_score > 0.7:
@@ -262,6 +329,4 @@ def context_integration_demo():
             delta_text = f"{adjustment:+.2f}"
             st.metric("Risk Score With Context", f"{risk_level} ({new_score:.2f})", delta_text)
     else:
-        st.info("Select context sources above to see how they impact risk assessment.")
-    
-    return active_sources
\ No newline at end of file
+        st.info("Select context sources above to see how they impact risk assessment.")
\ No newline at end of file
@@ -1,361 +1,513 @@
 # utils/demo_data.py
+import streamlit as st
 import pandas as pd
 import numpy as np
 import networkx as nx
-import random
 import json
 import os
-from datetime import datetime, timedelta
+import zlib
+import functools
+import copy
+from types import MappingProxyType
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from utils.theme import COLORS
 
+# Prefer orjson for faster JSON encoding/decoding, fall back to the standard library
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Prefer pyarrow's vectorized CSV reader/writer, fall back to pandas
+try:
+    import pyarrow as pa
+    from pyarrow import csv as pacsv
+except ImportError:
+    pa = None
+
 # Constants for data generation
 DATA_DIR = "data"
 MONTHS = 12
 START_DATE = datetime(2023, 1, 1)
 
+# Applicant types and their data directories
+APPLICANT_TYPES = ("strong_applicant", "unclear_applicant", "challenged_applicant")
+APPLICANT_DIRS = {applicant_type: os.path.join(DATA_DIR, applicant_type) 
+                  for applicant_type in APPLICANT_TYPES}
+
+# Monthly dates for the time series, formatted once at import
+DATES = pd.date_range(START_DATE, periods=MONTHS, freq="30D")
+DATES_STR = DATES.strftime("%Y-%m-%d").to_numpy()
+
+# Formatted dates for the day offsets used by events and external context sources
+OFFSET_DAYS = (0, 14, 21, 28, 30, 35, 40, 42, 45, 50, 55, 60, 65, 70, 75, 85, 90, 95)
+OFFSET_DATES = dict(zip(
+    OFFSET_DAYS,
+    (np.datetime64(START_DATE, "D") + np.array(OFFSET_DAYS)).astype(str).tolist()
+))
+
+# Tabular files, saved one file each
+TABLE_FILES = ("financial_data", "risk_scores")
+
+# JSON artefacts saved together in one bundle file per applicant
+BUNDLE_FILENAME = "bundle"
+BUNDLED_FILES = ("company_profile", "events", "external_context", "knowledge_graphs",
+                 "next_best_information", "reasoning_paths", "confidence_components")
+
 def ensure_data_directories():
     """Ensure all necessary data directories exist."""
-    os.makedirs(DATA_DIR, exist_ok=True)
-    os.makedirs(os.path.join(DATA_DIR, "strong_applicant"), exist_ok=True)
-    os.makedirs(os.path.join(DATA_DIR, "unclear_applicant"), exist_ok=True)
-    os.makedirs(os.path.join(DATA_DIR, "challenged_applicant"), exist_ok=True)
+    # makedirs creates DATA_DIR along with each applicant directory
+    for dir_path in APPLICANT_DIRS.values():
+        os.makedirs(dir_path, exist_ok=True)
 
 def save_data(data, filename, applicant_type="strong_applicant"):
-    """Save data to JSON or CSV file in appropriate directory."""
-    dir_path = os.path.join(DATA_DIR, applicant_type)
+    """Save data to JSON, Parquet, or CSV file in appropriate directory."""
+    dir_path = APPLICANT_DIRS[applicant_type]
     
     if isinstance(data, pd.DataFrame):
-        # Save as CSV
-        data.to_csv(os.path.join(dir_path, f"{filename}.csv"), index=False)
+        # Save as Parquet when pyarrow is available, otherwise CSV
+        if pa is not None:
+            data.to_parquet(os.path.join(dir_path, f"{filename}.parquet"), 
+                            engine='pyarrow', compression='zstd', index=False)
+        else:
+            data.to_csv(os.path.join(dir_path, f"{filename}.csv"), index=False)
     else:
-        # Save as JSON
-        with open(os.path.join(dir_path, f"{filename}.json"), 'w') as f:
-            json.dump(data, f, indent=2, default=str)
+        # Once a bundle exists it is the only copy of the bundled artefacts, so they are
+        # updated inside it rather than written to a separate file it would shadow
+        if filename in BUNDLED_FILES and os.path.exists(os.path.join(dir_path, f"{BUNDLE_FILENAME}.json")):
+            bundle = load_data(BUNDLE_FILENAME, applicant_type)
+            bundle[filename] = data
+            data, filename = bundle, BUNDLE_FILENAME
+        
+        # Save as JSON, serializing to one payload and writing it in a single call
+        if orjson is not None:
+            payload = orjson.dumps(data, default=str, option=orjson.OPT_INDENT_2 
+                                   | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC)
+        else:
+            payload = json.dumps(data, indent=2, default=str).encode("utf-8")
+        
+        with open(os.path.join(dir_path, f"{filename}.json"), 'wb', buffering=0) as f:
+            f.write(payload)
+    
+    # The set of files on disk changed, so existence checks and reads must be redone
+    check_data_exists.cache_clear()
+    read_applicant_data.clear()
 
 def load_data(filename, applicant_type="strong_applicant", format="json"):
-    """Load data from file in appropriate directory."""
-    dir_path = os.path.join(DATA_DIR, applicant_type)
+    """Load data from file in appropriate directory.
+    
+    format is "json", "csv", "parquet", or "table" for whichever of Parquet or CSV was saved."""
+    dir_path = APPLICANT_DIRS[applicant_type]
+    
+    # A table is read from Parquet when that is what save_data wrote, otherwise from CSV
+    if format == "table":
+        if pa is not None and os.path.exists(os.path.join(dir_path, f"{filename}.parquet")):
+            format = "parquet"
+        else:
+            format = "csv"
     
-    if format == "csv":
+    if format == "parquet":
+        return pd.read_parquet(os.path.join(dir_path, f"{filename}.parquet"), engine='pyarrow')
+    elif format == "csv" and pa is not None:
+        # Keep dates as strings, matching what pandas.read_csv returns
+        convert_options = pacsv.ConvertOptions(column_types={"date": pa.string()})
+        return pacsv.read_csv(os.path.join(dir_path, f"{filename}.csv"), 
+                              convert_options=convert_options).to_pandas()
+    elif format == "csv":
         return pd.read_csv(os.path.join(dir_path, f"{filename}.csv"))
+    elif orjson is not None:
+        with open(os.path.join(dir_path, f"{filename}.json"), 'rb') as f:
+            return orjson.loads(f.read())
     else:
         with open(os.path.join(dir_path, f"{filename}.json"), 'r') as f:
             return json.load(f)
 
+def applicant_seed(applicant_type):
+    """Derive a stable RNG seed from the applicant type."""
+    # zlib.crc32 is stable across processes, unlike the salted built-in str hash
+    return zlib.crc32(applicant_type.encode("utf-8"))
+
+def compute_percent_deltas(df):
+    """Compute the percent change of each numeric column relative to its first row."""
+    numeric = df.select_dtypes(include="number")
+    return (numeric / numeric.iloc[0] - 1) * 100
+
+def frame_records(df):
+    """Convert a DataFrame to a list of row dicts in one pass, zipping the column names over the raw values."""
+    columns = list(df.columns)
+    return [dict(zip(columns, row)) for row in df.values.tolist()]
+
+def series_frame(series, dtype=np.float64):
+    """Build a dated DataFrame from monthly series stored as one contiguous 2-D block."""
+    arr = np.empty((MONTHS, len(series)), dtype=dtype)
+    for i, values in enumerate(series.values()):
+        arr[:, i] = values
+    
+    # Wrap the block in place rather than letting pandas copy it
+    df = pd.DataFrame(arr, columns=list(series), copy=False)
+    df.insert(0, 'date', DATES_STR)
+    return df
+
+@functools.lru_cache(maxsize=8)
 def check_data_exists(applicant_type="strong_applicant"):
-    """Check if data files exist for this applicant type."""
-    dir_path = os.path.join(DATA_DIR, applicant_type)
+    """Check if data files exist for this applicant type.
+    
+    Results are cached; save_data clears the cache after each write."""
+    dir_path = APPLICANT_DIRS[applicant_type]
     
-    # Check for basic files
-    basic_files = [
+    # Check for basic files, which newer data keeps in the bundle instead
+    basic_files = {
         "company_profile.json", 
-        "financial_data.csv", 
-        "risk_scores.csv",
         "events.json",
         "external_context.json"
-    ]
+    }
+    
+    # One directory read instead of a stat per file
+    try:
+        with os.scandir(dir_path) as entries:
+            present = {entry.name for entry in entries if entry.is_file()}
+    except FileNotFoundError:
+        return False
+    
+    has_basic_files = f"{BUNDLE_FILENAME}.json" in present or basic_files.issubset(present)
     
-    return all(os.path.exists(os.path.join(dir_path, f)) for f in basic_files)
+    # Tabular files may be stored as Parquet or CSV
+    return has_basic_files and all(
+        f"{name}.parquet" in present or f"{name}.csv" in present for name in TABLE_FILES
+    )
+
+# Base profiles for each applicant type
+COMPANY_PROFILES = {
+    "strong_applicant": {
+        "name": "TechInnovate Solutions",
+        "industry": "Software Development",
+        "business_type": "B2B SaaS Platform",
+        "years_in_business": 7,
+        "employees": 48,
+        "location": "Austin, TX",
+        "ownership_structure": "LLC",
+        "management_team_size": 5,
+        "management_experience_years": 15,
+        "customer_count": 120,
+        "largest_customer_percentage": 12,
+        "loan_amount_requested": 500000,
+        "loan_purpose": "Expansion into new markets",
+        "loan_term_requested": 5,
+        "collateral_offered": "Intellectual property and equipment",
+        "previous_loans": 1,
+        "previous_loans_repaid": 1,
+        "credit_score": "A",
+        "description": "TechInnovate Solutions provides cloud-based workflow automation software for professional services firms. With a stable customer base and strong management team, they're seeking funding to expand into healthcare and financial services verticals."
+    },
+    "unclear_applicant": {
+        "name": "ManufacturePro Inc.",
+        "industry": "Manufacturing",
+        "business_type": "Custom Metal Fabrication",
+        "years_in_business": 12,
+        "employees": 73,
+        "location": "Detroit, MI",
+        "ownership_structure": "S-Corp",
+        "management_team_size": 4,
+        "management_experience_years": 20,
+        "customer_count": 45,
+        "largest_customer_percentage": 28,
+        "loan_amount_requested": 750000,
+        "loan_purpose": "Equipment modernization",
+        "loan_term_requested": 7,
+        "collateral_offered": "Equipment and property",
+        "previous_loans": 3,
+        "previous_loans_repaid": 3,
+        "credit_score": "B+",
+        "description": "ManufacturePro specializes in custom metal fabrication for automotive and aerospace industries. While they have a strong history, they face increasing competition from overseas and need to modernize equipment to remain competitive."
+    },
+    "challenged_applicant": {
+        "name": "RetailGiant Stores",
+        "industry": "Retail",
+        "business_type": "Multi-location Retail Chain",
+        "years_in_business": 15,
+        "employees": 95,
+        "location": "Phoenix, AZ",
+        "ownership_structure": "C-Corp",
+        "management_team_size": 6,
+        "management_experience_years": 8,
+        "customer_count": "General public",
+        "largest_customer_percentage": "N/A",
+        "loan_amount_requested": 1200000,
+        "loan_purpose": "Debt consolidation and store renovations",
+        "loan_term_requested": 10,
+        "collateral_offered": "Real estate and inventory",
+        "previous_loans": 5,
+        "previous_loans_repaid": 4,
+        "credit_score": "C+",
+        "description": "RetailGiant operates a chain of general merchandise stores across Arizona. They face significant challenges from e-commerce disruption, have experienced recent management turnover, and need funding to consolidate existing debt and renovate stores to remain viable."
+    }
+}
 
 def generate_company_profile(applicant_type="strong_applicant"):
     """Generate a detailed company profile based on applicant type."""
-    
-    # Base profiles for each applicant type
-    profiles = {
-        "strong_applicant": {
-            "name": "TechInnovate Solutions",
-            "industry": "Software Development",
-            "business_type": "B2B SaaS Platform",
-            "years_in_business": 7,
-            "employees": 48,
-            "location": "Austin, TX",
-            "ownership_structure": "LLC",
-            "management_team_size": 5,
-            "management_experience_years": 15,
-            "customer_count": 120,
-            "largest_customer_percentage": 12,
-            "loan_amount_requested": 500000,
-            "loan_purpose": "Expansion into new markets",
-            "loan_term_requested": 5,
-            "collateral_offered": "Intellectual property and equipment",
-            "previous_loans": 1,
-            "previous_loans_repaid": 1,
-            "credit_score": "A",
-            "description": "TechInnovate Solutions provides cloud-based workflow automation software for professional services firms. With a stable customer base and strong management team, they're seeking funding to expand into healthcare and financial services verticals."
-        },
-        "unclear_applicant": {
-            "name": "ManufacturePro Inc.",
-            "industry": "Manufacturing",
-            "business_type": "Custom Metal Fabrication",
-            "years_in_business": 12,
-            "employees": 73,
-            "location": "Detroit, MI",
-            "ownership_structure": "S-Corp",
-            "management_team_size": 4,
-            "management_experience_years": 20,
-            "customer_count": 45,
-            "largest_customer_percentage": 28,
-            "loan_amount_requested": 750000,
-            "loan_purpose": "Equipment modernization",
-            "loan_term_requested": 7,
-            "collateral_offered": "Equipment and property",
-            "previous_loans": 3,
-            "previous_loans_repaid": 3,
-            "credit_score": "B+",
-            "description": "ManufacturePro specializes in custom metal fabrication for automotive and aerospace industries. While they have a strong history, they face increasing competition from overseas and need to modernize equipment to remain competitive."
-        },
-        "challenged_applicant": {
-            "name": "RetailGiant Stores",
-            "industry": "Retail",
-            "business_type": "Multi-location Retail Chain",
-            "years_in_business": 15,
-            "employees": 95,
-            "location": "Phoenix, AZ",
-            "ownership_structure": "C-Corp",
-            "management_team_size": 6,
-            "management_experience_years": 8,
-            "customer_count": "General public",
-            "largest_customer_percentage": "N/A",
-            "loan_amount_requested": 1200000,
-            "loan_purpose": "Debt consolidation and store renovations",
-            "loan_term_requested": 10,
-            "collateral_offered": "Real estate and inventory",
-            "previous_loans": 5,
-            "previous_loans_repaid": 4,
-            "credit_score": "C+",
-            "description": "RetailGiant operates a chain of general merchandise stores across Arizona. They face significant challenges from e-commerce disruption, have experienced recent management turnover, and need funding to consolidate existing debt and renovate stores to remain viable."
-        }
+    # Return a copy of the appropriate profile; its values are all scalars
+    return dict(COMPANY_PROFILES[applicant_type])
+
+# Base values and trends for the financial series of each applicant type
+FINANCIAL_PARAMS = {
+    "strong_applicant": {
+        "base_revenue": 250000,
+        "revenue_trend": 0.03,  # 3% monthly growth
+        "base_profit_margin": 0.18,
+        "margin_trend": 0.001,  # Slight improvement
+        "base_cash_balance": 180000,
+        "cash_trend": 0.02,
+        "base_debt_ratio": 0.25,
+        "debt_trend": -0.005,  # Decreasing debt
+        "volatility": 0.05  # Low volatility
+    },
+    "unclear_applicant": {
+        "base_revenue": 420000,
+        "revenue_trend": 0.01,  # 1% monthly growth
+        "base_profit_margin": 0.12,
+        "margin_trend": -0.002,  # Slight decline
+        "base_cash_balance": 210000,
+        "cash_trend": 0.005,
+        "base_debt_ratio": 0.38,
+        "debt_trend": 0.001,  # Slight increase
+        "volatility": 0.08  # Medium volatility
+    },
+    "challenged_applicant": {
+        "base_revenue": 580000,
+        "revenue_trend": -0.02,  # 2% monthly decline
+        "base_profit_margin": 0.08,
+        "margin_trend": -0.004,  # Declining
+        "base_cash_balance": 150000,
+        "cash_trend": -0.03,
+        "base_debt_ratio": 0.45,
+        "debt_trend": 0.01,  # Increasing debt
+        "volatility": 0.12  # High volatility
     }
-    
-    # Return the appropriate profile
-    return profiles[applicant_type]
+}
 
-def generate_financial_data(applicant_type="strong_applicant"):
-    """Generate financial time series data based on applicant type."""
-    
-    # Create dates array
-    dates = [START_DATE + timedelta(days=30*i) for i in range(MONTHS)]
-    dates_str = [d.strftime("%Y-%m-%d") for d in dates]
+# Bounded ratio columns that are stored in float32
+RATIO_COLUMNS = ("profit_margin", "debt_ratio", "capacity_utilization")
+
+# Industry-specific metrics as (column, base value, monthly trend) for each applicant type
+INDUSTRY_SERIES = {
+    "strong_applicant": (
+        ("customer_acquisition_cost", 350, 0.0),
+        ("monthly_recurring_revenue", 250000 * 0.7, 0.03),
+        ("customer_lifetime_value", 2100, 0.01)
+    ),
+    "unclear_applicant": (
+        ("raw_material_costs", 420000 * 0.4, 0.015),
+        ("capacity_utilization", 0.72, -0.005),
+        ("order_backlog", 420000 * 1.2, -0.01)
+    ),
+    "challenged_applicant": (
+        ("same_store_sales_growth", -0.03, -0.1),
+        ("inventory_turnover", 4.2, -0.02),
+        ("customer_traffic", 8500, -0.025)
+    )
+}
+
+def build_financial_frames(applicant_types, rngs):
+    """
+    Generate financial time series for several applicant types in one vectorized pass.
     
-    # Set base values and trends based on applicant type
-    if applicant_type == "strong_applicant":
-        base_revenue = 250000
-        revenue_trend = 0.03  # 3% monthly growth
-        base_profit_margin = 0.18
-        margin_trend = 0.001  # Slight improvement
-        base_cash_balance = 180000
-        cash_trend = 0.02
-        base_debt_ratio = 0.25
-        debt_trend = -0.005  # Decreasing debt
-        volatility = 0.05  # Low volatility
+    Args:
+        applicant_types: Sequence of applicant type keys
+        rngs: NumPy random Generators, one per applicant type, supplying its noise
+        
+    Returns:
+        Dictionary mapping each applicant type to its financial DataFrame
+    """
+    # Stack each parameter into an (n_applicants, 1) column for broadcasting over months
+    params = {
+        key: np.array([FINANCIAL_PARAMS[t][key] for t in applicant_types], dtype=float)[:, None]
+        for key in FINANCIAL_PARAMS["strong_applicant"]
+    }
+    industry_base = np.array([[base for _, base, _ in INDUSTRY_SERIES[t]] for t in applicant_types])
+    industry_trend = np.array([[trend for _, _, trend in INDUSTRY_SERIES[t]] for t in applicant_types])
     
-    elif applicant_type == "unclear_applicant":
-        base_revenue = 420000
-        revenue_trend = 0.01  # 1% monthly growth
-        base_profit_margin = 0.12
-        margin_trend = -0.002  # Slight decline
-        base_cash_balance = 210000
-        cash_trend = 0.005
-        base_debt_ratio = 0.38
-        debt_trend = 0.001  # Slight increase
-        volatility = 0.08  # Medium volatility
+    # One noise draw per applicant for all of its series, so each applicant's slice matches
+    # its own seeded stream, stacked and scaled by each applicant's volatility
+    idx = np.arange(MONTHS)
+    noise = np.stack([rng.uniform(-1, 1, size=(9, MONTHS)) for rng in rngs], axis=1) * params["volatility"]
     
-    elif applicant_type == "challenged_applicant":
-        base_revenue = 580000
-        revenue_trend = -0.02  # 2% monthly decline
-        base_profit_margin = 0.08
-        margin_trend = -0.004  # Declining
-        base_cash_balance = 150000
-        cash_trend = -0.03
-        base_debt_ratio = 0.45
-        debt_trend = 0.01  # Increasing debt
-        volatility = 0.12  # High volatility
-    
-    # Generate data with trends and noise
-    data = {
-        'date': dates_str,
-        'revenue': [base_revenue * (1 + revenue_trend*i + random.uniform(-volatility, volatility)) 
-                   for i in range(MONTHS)],
-        'profit_margin': [max(0.01, base_profit_margin * (1 + margin_trend*i + random.uniform(-volatility, volatility)))
-                         for i in range(MONTHS)],
-        'cash_balance': [base_cash_balance * (1 + cash_trend*i + random.uniform(-volatility, volatility)) 
-                        for i in range(MONTHS)],
-        'debt_ratio': [min(0.9, max(0.1, base_debt_ratio * (1 + debt_trend*i + random.uniform(-volatility/2, volatility/2))))
-                      for i in range(MONTHS)],
-        'accounts_receivable': [base_revenue * 0.3 * (1 + random.uniform(-volatility, volatility))
-                               for i in range(MONTHS)],
-        'inventory': [base_revenue * 0.25 * (1 + random.uniform(-volatility, volatility))
-                     for i in range(MONTHS)]
+    base_revenue = params["base_revenue"]
+    common = {
+        'revenue': base_revenue * (1 + params["revenue_trend"]*idx + noise[0]),
+        'profit_margin': np.maximum(0.01, params["base_profit_margin"] * (1 + params["margin_trend"]*idx + noise[1])),
+        'cash_balance': params["base_cash_balance"] * (1 + params["cash_trend"]*idx + noise[2]),
+        'debt_ratio': np.clip(params["base_debt_ratio"] * (1 + params["debt_trend"]*idx + noise[3] * 0.5), 0.1, 0.9),
+        'accounts_receivable': base_revenue * 0.3 * (1 + noise[4]),
+        'inventory': base_revenue * 0.25 * (1 + noise[5])
     }
     
-    # Add industry-specific metrics
-    if applicant_type == "strong_applicant":
-        data['customer_acquisition_cost'] = [350 * (1 + random.uniform(-volatility, volatility))
-                                           for i in range(MONTHS)]
-        data['monthly_recurring_revenue'] = [base_revenue * 0.7 * (1 + revenue_trend*i + random.uniform(-volatility, volatility))
-                                           for i in range(MONTHS)]
-        data['customer_lifetime_value'] = [2100 * (1 + 0.01*i + random.uniform(-volatility, volatility))
-                                         for i in range(MONTHS)]
+    # Industry-specific metrics, shaped (n_applicants, 3, MONTHS)
+    industry = industry_base[:, :, None] * (
+        1 + industry_trend[:, :, None] * idx + noise[6:9].transpose(1, 0, 2)
+    )
     
-    elif applicant_type == "unclear_applicant":
-        data['raw_material_costs'] = [base_revenue * 0.4 * (1 + 0.015*i + random.uniform(-volatility, volatility))
-                                    for i in range(MONTHS)]
-        data['capacity_utilization'] = [0.72 * (1 + -0.005*i + random.uniform(-volatility, volatility))
-                                       for i in range(MONTHS)]
-        data['order_backlog'] = [base_revenue * 1.2 * (1 + -0.01*i + random.uniform(-volatility, volatility))
-                               for i in range(MONTHS)]
+    frames = {}
+    for k, applicant_type in enumerate(applicant_types):
+        data = {column: values[k] for column, values in common.items()}
+        for j, (column, _, _) in enumerate(INDUSTRY_SERIES[applicant_type]):
+            data[column] = industry[k, j]
+        frame = series_frame(data)
+        frames[applicant_type] = frame.astype({col: np.float32 for col in RATIO_COLUMNS if col in frame})
     
-    elif applicant_type == "challenged_applicant":
-        data['same_store_sales_growth'] = [-0.03 * (1 - 0.1*i + random.uniform(-volatility, volatility))
-                                         for i in range(MONTHS)]
-        data['inventory_turnover'] = [4.2 * (1 + -0.02*i + random.uniform(-volatility, volatility))
-                                     for i in range(MONTHS)]
-        data['customer_traffic'] = [8500 * (1 + -0.025*i + random.uniform(-volatility, volatility))
-                                   for i in range(MONTHS)]
+    return frames
+
+@functools.lru_cache(maxsize=8)
+def generate_financial_data(applicant_type="strong_applicant", seed=None):
+    """Generate financial time series data based on applicant type.
     
-    # Convert to DataFrame
-    return pd.DataFrame(data)
+    Output is deterministic per (applicant_type, seed) and cached; callers must not mutate it."""
+    rng = np.random.default_rng(applicant_seed(applicant_type) if seed is None else seed)
+    return build_financial_frames((applicant_type,), (rng,))[applicant_type]
 
-def generate_events(applicant_type="strong_applicant"):
-    """Generate timeline events based on applicant type."""
+def generate_all_financials(seed=None):
+    """Generate financial time series for every applicant type in one vectorized pass.
     
-    # Create base events common to all applicants
-    events = [
+    Each applicant is seeded exactly as in generate_financial_data, so the results match it."""
+    rngs = [np.random.default_rng(applicant_seed(t) if seed is None else seed) for t in APPLICANT_TYPES]
+    return build_financial_frames(APPLICANT_TYPES, rngs)
+
+# Base events common to all applicants
+BASE_EVENTS = [
+    {
+        'date': OFFSET_DATES[0],
+        'event': 'Initial loan application submitted',
+        'category': 'application',
+        'type': 'info',
+        'description': 'Company submitted loan application with basic business information.'
+    },
+    {
+        'date': OFFSET_DATES[14],
+        'event': 'Financial statements requested',
+        'category': 'information',
+        'type': 'info',
+        'description': 'Underwriter requested detailed financial statements for the past 12 months.'
+    },
+    {
+        'date': OFFSET_DATES[21],
+        'event': 'Financial statements received',
+        'category': 'information',
+        'type': 'info',
+        'description': 'Company provided required financial statements showing operational history.'
+    }
+]
+
+# Applicant-specific events appended after the base events
+APPLICANT_EVENTS = {
+    "strong_applicant": [
         {
-            'date': (START_DATE + timedelta(days=0)).strftime("%Y-%m-%d"),
-            'event': 'Initial loan application submitted',
-            'category': 'application',
-            'type': 'info',
-            'description': 'Company submitted loan application with basic business information.'
+            'date': OFFSET_DATES[35],
+            'event': 'New customer contract signed',
+            'category': 'company',
+            'type': 'positive',
+            'description': 'Company secured a significant new customer contract increasing projected revenue by 15%.'
+        },
+        {
+            'date': OFFSET_DATES[60],
+            'event': 'Industry growth report published',
+            'category': 'external',
+            'type': 'positive',
+            'description': 'Industry report shows 18% growth projection for SaaS sector over next 24 months.'
+        },
+        {
+            'date': OFFSET_DATES[75],
+            'event': 'Preliminary approval issued',
+            'category': 'approval',
+            'type': 'positive',
+            'description': 'Based on strong financials and industry outlook, preliminary approval issued.'
         },
         {
-            'date': (START_DATE + timedelta(days=14)).strftime("%Y-%m-%d"),
-            'event': 'Financial statements requested',
+            'date': OFFSET_DATES[90],
+            'event': 'Final terms accepted',
+            'category': 'approval',
+            'type': 'positive',
+            'description': 'Company accepted final loan terms with favorable interest rate.'
+        }
+    ],
+    "unclear_applicant": [
+        {
+            'date': OFFSET_DATES[30],
+            'event': 'Customer concentration clarification requested',
             'category': 'information',
-            'type': 'info',
-            'description': 'Underwriter requested detailed financial statements for the past 12 months.'
+            'type': 'warning',
+            'description': 'Underwriter requested clarification about 28% revenue from single customer.'
         },
         {
-            'date': (START_DATE + timedelta(days=21)).strftime("%Y-%m-%d"),
-            'event': 'Financial statements received',
+            'date': OFFSET_DATES[45],
+            'event': 'Supply chain disruption reported',
+            'category': 'external',
+            'type': 'warning',
+            'description': 'Industry news reported potential supply chain disruptions affecting raw material costs.'
+        },
+        {
+            'date': OFFSET_DATES[65],
+            'event': 'Updated business plan requested',
             'category': 'information',
             'type': 'info',
-            'description': 'Company provided required financial statements showing operational history.'
+            'description': 'Detailed modernization plan and competitive analysis requested to clarify growth strategy.'
+        },
+        {
+            'date': OFFSET_DATES[85],
+            'event': 'Conditional approval issued',
+            'category': 'approval',
+            'type': 'info',
+            'description': 'Conditional approval with additional reporting requirements and slightly higher interest rate.'
+        }
+    ],
+    "challenged_applicant": [
+        {
+            'date': OFFSET_DATES[28],
+            'event': 'Management changes disclosed',
+            'category': 'company',
+            'type': 'negative',
+            'description': 'Disclosed that CFO and Operations Director left the company within past 90 days.'
+        },
+        {
+            'date': OFFSET_DATES[42],
+            'event': 'E-commerce impact report published',
+            'category': 'external',
+            'type': 'negative',
+            'description': 'Industry analysis shows physical retailers in sector losing 12% market share annually to e-commerce.'
+        },
+        {
+            'date': OFFSET_DATES[50],
+            'event': 'Late payment on existing loan',
+            'category': 'financial',
+            'type': 'negative',
+            'description': 'Company made 15-day late payment on existing equipment loan.'
+        },
+        {
+            'date': OFFSET_DATES[70],
+            'event': 'Restructuring plan requested',
+            'category': 'information',
+            'type': 'warning',
+            'description': 'Detailed debt restructuring and business turnaround plan requested.'
+        },
+        {
+            'date': OFFSET_DATES[95],
+            'event': 'Application declined',
+            'category': 'decision',
+            'type': 'negative',
+            'description': 'Loan application declined due to declining financial performance and industry outlook.'
         }
     ]
+}
+
+def generate_events(applicant_type="strong_applicant"):
+    """Generate timeline events based on applicant type."""
+    # Event dicts are shared module constants; only the list is new per call
+    return BASE_EVENTS + APPLICANT_EVENTS[applicant_type]
+
+@functools.lru_cache(maxsize=8)
+def generate_risk_scores(applicant_type="strong_applicant", seed=None):
+    """Generate risk assessment scores over time based on applicant type.
     
-    # Add applicant-specific events
-    if applicant_type == "strong_applicant":
-        events.extend([
-            {
-                'date': (START_DATE + timedelta(days=35)).strftime("%Y-%m-%d"),
-                'event': 'New customer contract signed',
-                'category': 'company',
-                'type': 'positive',
-                'description': 'Company secured a significant new customer contract increasing projected revenue by 15%.'
-            },
-            {
-                'date': (START_DATE + timedelta(days=60)).strftime("%Y-%m-%d"),
-                'event': 'Industry growth report published',
-                'category': 'external',
-                'type': 'positive',
-                'description': 'Industry report shows 18% growth projection for SaaS sector over next 24 months.'
-            },
-            {
-                'date': (START_DATE + timedelta(days=75)).strftime("%Y-%m-%d"),
-                'event': 'Preliminary approval issued',
-                'category': 'approval',
-                'type': 'positive',
-                'description': 'Based on strong financials and industry outlook, preliminary approval issued.'
-            },
-            {
-                'date': (START_DATE + timedelta(days=90)).strftime("%Y-%m-%d"),
-                'event': 'Final terms accepted',
-                'category': 'approval',
-                'type': 'positive',
-                'description': 'Company accepted final loan terms with favorable interest rate.'
-            }
-        ])
-    
-    elif applicant_type == "unclear_applicant":
-        events.extend([
-            {
-                'date': (START_DATE + timedelta(days=30)).strftime("%Y-%m-%d"),
-                'event': 'Customer concentration clarification requested',
-                'category': 'information',
-                'type': 'warning',
-                'description': 'Underwriter requested clarification about 28% revenue from single customer.'
-            },
-            {
-                'date': (START_DATE + timedelta(days=45)).strftime("%Y-%m-%d"),
-                'event': 'Supply chain disruption reported',
-                'category': 'external',
-                'type': 'warning',
-                'description': 'Industry news reported potential supply chain disruptions affecting raw material costs.'
-            },
-            {
-                'date': (START_DATE + timedelta(days=65)).strftime("%Y-%m-%d"),
-                'event': 'Updated business plan requested',
-                'category': 'information',
-                'type': 'info',
-                'description': 'Detailed modernization plan and competitive analysis requested to clarify growth strategy.'
-            },
-            {
-                'date': (START_DATE + timedelta(days=85)).strftime("%Y-%m-%d"),
-                'event': 'Conditional approval issued',
-                'category': 'approval',
-                'type': 'info',
-                'description': 'Conditional approval with additional reporting requirements and slightly higher interest rate.'
-            }
-        ])
-    
-    elif applicant_type == "challenged_applicant":
-        events.extend([
-            {
-                'date': (START_DATE + timedelta(days=28)).strftime("%Y-%m-%d"),
-                'event': 'Management changes disclosed',
-                'category': 'company',
-                'type': 'negative',
-                'description': 'Disclosed that CFO and Operations Director left the company within past 90 days.'
-            },
-            {
-                'date': (START_DATE + timedelta(days=42)).strftime("%Y-%m-%d"),
-                'event': 'E-commerce impact report published',
-                'category': 'external',
-                'type': 'negative',
-                'description': 'Industry analysis shows physical retailers in sector losing 12% market share annually to e-commerce.'
-            },
-            {
-                'date': (START_DATE + timedelta(days=50)).strftime("%Y-%m-%d"),
-                'event': 'Late payment on existing loan',
-                'category': 'financial',
-                'type': 'negative',
-                'description': 'Company made 15-day late payment on existing equipment loan.'
-            },
-            {
-                'date': (START_DATE + timedelta(days=70)).strftime("%Y-%m-%d"),
-                'event': 'Restructuring plan requested',
-                'category': 'information',
-                'type': 'warning',
-                'description': 'Detailed debt restructuring and business turnaround plan requested.'
-            },
-            {
-                'date': (START_DATE + timedelta(days=95)).strftime("%Y-%m-%d"),
-                'event': 'Application declined',
-                'category': 'decision',
-                'type': 'negative',
-                'description': 'Loan application declined due to declining financial performance and industry outlook.'
-            }
-        ])
-    
-    return events
-
-def generate_risk_scores(applicant_type="strong_applicant"):
-    """Generate risk assessment scores over time based on applicant type."""
-    
-    # Create dates array
-    dates = [START_DATE + timedelta(days=30*i) for i in range(MONTHS)]
-    dates_str = [d.strftime("%Y-%m-%d") for d in dates]
+    Output is deterministic per (applicant_type, seed) and cached; callers must not mutate it."""
     
     # Set base values and trends based on applicant type
     if applicant_type == "strong_applicant":
@@ -379,33 +531,34 @@ def generate_risk_scores(applicant_type="strong_applicant"):
         confidence_trend = 0.005  # Barely increasing confidence
         volatility = 0.10
     
-    # Generate data with trends and noise
+    # Generate data with trends and noise, one vector expression per series,
+    # slicing every series' noise from a single batched draw
+    rng = np.random.default_rng(applicant_seed(applicant_type) if seed is None else seed)
+    idx = np.arange(MONTHS)
+    noise = rng.uniform(-volatility, volatility, size=(6, MONTHS))
+    
+    risk_score = np.clip(base_risk + risk_trend*idx + noise[0], 0.05, 0.95)
     data = {
-        'date': dates_str,
-        'risk_score': [min(0.95, max(0.05, base_risk + risk_trend*i + random.uniform(-volatility, volatility))) 
-                      for i in range(MONTHS)],
-        'confidence_score': [min(0.95, max(0.30, base_confidence + confidence_trend*i + random.uniform(-volatility, volatility))) 
-                            for i in range(MONTHS)]
+        'risk_score': risk_score,
+        'confidence_score': np.clip(base_confidence + confidence_trend*idx + noise[1], 0.30, 0.95)
     }
     
     # Add component scores
-    data['financial_health_score'] = [min(0.95, max(0.05, 1 - (data['risk_score'][i] * 0.8 + random.uniform(-volatility, volatility))))
-                                     for i in range(MONTHS)]
-    
-    data['management_risk_score'] = [min(0.95, max(0.05, data['risk_score'][i] * 0.9 + random.uniform(-volatility, volatility)))
-                                    for i in range(MONTHS)]
-    
-    data['industry_risk_score'] = [min(0.95, max(0.05, data['risk_score'][i] * 1.1 + random.uniform(-volatility, volatility)))
-                                  for i in range(MONTHS)]
+    data['financial_health_score'] = np.clip(1 - (risk_score * 0.8 + noise[2]), 0.05, 0.95)
     
-    data['external_context_score'] = [min(0.95, max(0.05, data['risk_score'][i] * 0.95 + random.uniform(-volatility, volatility)))
-                                     for i in range(MONTHS)]
+    # The risk-proportional components share one broadcast over (3, MONTHS)
+    component_coeffs = np.array([0.9, 1.1, 0.95])[:, None]
+    components = np.clip(component_coeffs * risk_score + noise[3:6], 0.05, 0.95)
+    data['management_risk_score'], data['industry_risk_score'], data['external_context_score'] = components
     
-    # Convert to DataFrame
-    return pd.DataFrame(data)
+    # Convert to DataFrame; scores are bounded in [0, 1], so float32 is ample
+    return series_frame(data, dtype=np.float32)
 
+@functools.lru_cache(maxsize=4)
 def generate_external_context(applicant_type="strong_applicant"):
-    """Generate external context data based on applicant type."""
+    """Generate external context data based on applicant type.
+    
+    Output is cached; callers must not mutate it."""
     
     # Base context sources common to all applicants
     context = {
@@ -417,13 +570,13 @@ def generate_external_context(applicant_type="strong_applicant"):
                     "name": "Industry Growth Forecast",
                     "type": "report",
                     "reliability": 0.88,
-                    "date": (START_DATE + timedelta(days=45)).strftime("%Y-%m-%d")
+                    "date": OFFSET_DATES[45]
                 },
                 {
                     "name": "Market Size Analysis",
                     "type": "market_research",
                     "reliability": 0.82,
-                    "date": (START_DATE + timedelta(days=60)).strftime("%Y-%m-%d")
+                    "date": OFFSET_DATES[60]
                 }
             ]
         },
@@ -435,13 +588,13 @@ def generate_external_context(applicant_type="strong_applicant"):
                     "name": "Federal Reserve Interest Rate Guidance",
                     "type": "official",
                     "reliability": 0.95,
-                    "date": (START_DATE + timedelta(days=30)).strftime("%Y-%m-%d")
+                    "date": OFFSET_DATES[30]
                 },
                 {
                     "name": "Quarterly GDP Report",
                     "type": "official",
                     "reliability": 0.90,
-                    "date": (START_DATE + timedelta(days=50)).strftime("%Y-%m-%d")
+                    "date": OFFSET_DATES[50]
                 }
             ]
         }
@@ -459,14 +612,14 @@ def generate_external_context(applicant_type="strong_applicant"):
                     "name": "SaaS Adoption Survey",
                     "type": "market_research",
                     "reliability": 0.78,
-                    "date": (START_DATE + timedelta(days=55)).strftime("%Y-%m-%d"),
+                    "date": OFFSET_DATES[55],
                     "content": "Survey shows 42% increase in SaaS adoption among mid-sized businesses."
                 },
                 {
                     "name": "Cloud Technology Forecast",
                     "type": "analyst_report",
                     "reliability": 0.85,
-                    "date": (START_DATE + timedelta(days=70)).strftime("%Y-%m-%d"),
+                    "date": OFFSET_DATES[70],
                     "content": "Projected 22% CAGR for cloud workflow solutions over next 5 years."
                 }
             ]
@@ -481,14 +634,14 @@ def generate_external_context(applicant_type="strong_applicant"):
                     "name": "Competitor Funding News",
                     "type": "news",
                     "reliability": 0.70,
-                    "date": (START_DATE + timedelta(days=40)).strftime("%Y-%m-%d"),
+                    "date": OFFSET_DATES[40],
                     "content": "Two competitors secured Series B funding, validating market potential."
                 },
                 {
                     "name": "Market Share Analysis",
                     "type": "market_research",
                     "reliability": 0.80,
-                    "date": (START_DATE + timedelta(days=65)).strftime("%Y-%m-%d"),
+                    "date": OFFSET_DATES[65],
                     "content": "Company has gained 2.5% market share in the past year."
                 }
             ]
@@ -505,14 +658,14 @@ def generate_external_context(applicant_type="strong_applicant"):
                     "name": "Materials Cost Index",
                     "type": "industry_data",
                     "reliability": 0.85,
-                    "date": (START_DATE + timedelta(days=35)).strftime("%Y-%m-%d"),
+                    "date": OFFSET_DATES[35],
                     "content": "Raw material costs increased 15% over past quarter."
                 },
                 {
                     "name": "Supply Chain Disruption Report",
                     "type": "news",
                     "reliability": 0.72,
-                    "date": (START_DATE + timedelta(days=55)).strftime("%Y-%m-%d"),
+                    "date": OFFSET_DATES[55],
                     "content": "Transportation delays affecting 40% of manufacturers in the sector."
                 }
             ]
@@ -527,14 +680,14 @@ def generate_external_context(applicant_type="strong_applicant"):
                     "name": "Manufacturing Automation Report",
                     "type": "industry_report",
                     "reliability": 0.82,
-                    "date": (START_DATE + timedelta(days=60)).strftime("%Y-%m-%d"),
+                    "date": OFFSET_DATES[60],
                     "content": "Companies investing in automation seeing 28% efficiency improvements."
                 },
                 {
                     "name": "Industry 4.0 Adoption Study",
                     "type": "academic_research",
                     "reliability": 0.88,
-                    "date": (START_DATE + timedelta(days=75)).strftime("%Y-%m-%d"),
+                    "date": OFFSET_DATES[75],
                     "content": "Early adopters of smart manufacturing technologies showing 22% cost advantage."
                 }
             ]
@@ -551,14 +704,14 @@ def generate_external_context(applicant_type="strong_applicant"):
                     "name": "Retail Sector Analysis",
                     "type": "industry_report",
                     "reliability": 0.92,
-                    "date": (START_DATE + timedelta(days=30)).strftime("%Y-%m-%d"),
+                    "date": OFFSET_DATES[30],
                     "content": "Physical retail locations decreasing at 8% annually in this segment."
                 },
                 {
                     "name": "E-commerce Impact Study",
                     "type": "market_research",
                     "reliability": 0.88,
-                    "date": (START_DATE + timedelta(days=50)).strftime("%Y-%m-%d"),
+                    "date": OFFSET_DATES[50],
                     "content": "E-commerce now accounts for 35% of sales in this category, up from 22% last year."
                 }
             ]
@@ -573,14 +726,14 @@ def generate_external_context(applicant_type="strong_applicant"):
                     "name": "Consumer Spending Trends",
                     "type": "market_research",
                     "reliability": 0.78,
-                    "date": (START_DATE + timedelta(days=40)).strftime("%Y-%m-%d"),
+                    "date": OFFSET_DATES[40],
                     "content": "In-store visits down 22% year-over-year for this retail category."
                 },
                 {
                     "name": "Shopping Pattern Analysis",
                     "type": "behavioral_research",
                     "reliability": 0.72,
-                    "date": (START_DATE + timedelta(days=65)).strftime("%Y-%m-%d"),
+                    "date": OFFSET_DATES[65],
                     "content": "Consumers increasingly research online before making purchases, with 62% comparing prices digitally."
                 }
             ]
@@ -588,296 +741,361 @@ def generate_external_context(applicant_type="strong_applicant"):
     
     return context
 
+# Journey stages
+JOURNEY_STAGES = [
+    "Initial Application",
+    "Information Gathering",
+    "Risk Assessment",
+    "Decision Point",
+    "Monitoring Phase"
+]
+
+# Graph complexity at each stage
+STAGE_COMPLEXITY = {
+    "Initial Application": {
+        "node_count": 10,
+        "relationship_types": ["basic_info", "industry", "loan_request"],
+        "confidence": 0.45
+    },
+    "Information Gathering": {
+        "node_count": 25,
+        "relationship_types": ["basic_info", "industry", "loan_request", "financials", "management", "ownership"],
+        "confidence": 0.65
+    },
+    "Risk Assessment": {
+        "node_count": 40,
+        "relationship_types": ["basic_info", "industry", "loan_request", "financials", "management", "ownership", "external_context", "market_position"],
+        "confidence": 0.75
+    },
+    "Decision Point": {
+        "node_count": 45,
+        "relationship_types": ["basic_info", "industry", "loan_request", "financials", "management", "ownership", "external_context", "market_position", "risk_factors"],
+        "confidence": 0.85
+    },
+    "Monitoring Phase": {
+        "node_count": 55,
+        "relationship_types": ["basic_info", "industry", "loan_request", "financials", "management", "ownership", "external_context", "market_position", "risk_factors", "temporal_patterns"],
+        "confidence": 0.88
+    }
+}
+
 def generate_knowledge_graphs(applicant_type="strong_applicant"):
     """Generate knowledge graph evolution data based on applicant type."""
     # This is a placeholder for the structure - actual graph data would be created
     # at runtime based on this metadata when visualizing
     
-    # Journey stages
-    stages = [
-        "Initial Application",
-        "Information Gathering",
-        "Risk Assessment",
-        "Decision Point",
-        "Monitoring Phase"
-    ]
-    
-    # Graph complexity at each stage
-    stage_complexity = {
-        "Initial Application": {
-            "node_count": 10,
-            "relationship_types": ["basic_info", "industry", "loan_request"],
-            "confidence": 0.45
-        },
+    return {
+        "stages": JOURNEY_STAGES,
+        "complexity": STAGE_COMPLEXITY
+    }
+
+# Common information value categories
+BASE_INFO_VALUE = {
+    "Initial Application": {
+        "Financial Statements": 0.85,
+        "Management Background": 0.65,
+        "Customer Contracts": 0.60,
+        "Existing Debt Details": 0.72,
+        "Business Plan": 0.58
+    },
+    "Information Gathering": {
+        "Industry Forecast": 0.70,
+        "Competitive Analysis": 0.65,
+        "Detailed Cash Flow Projections": 0.82,
+        "Customer Concentration Details": 0.75,
+        "Collateral Valuation": 0.68
+    },
+    "Risk Assessment": {
+        "Supply Chain Stability": 0.60,
+        "Key Personnel Background": 0.55,
+        "Technology Infrastructure": 0.50,
+        "Regulatory Compliance Status": 0.58,
+        "Market Share Trend": 0.65
+    },
+    "Decision Point": {
+        "Stress Test Scenarios": 0.72,
+        "Risk Mitigation Options": 0.68,
+        "Additional Collateral Options": 0.60,
+        "Reference Checks": 0.52,
+        "Monitoring Plan": 0.75
+    },
+    "Monitoring Phase": {
+        "Updated Financial Statements": 0.88,
+        "Industry News Updates": 0.70,
+        "Payment Pattern Analysis": 0.82,
+        "Management Changes": 0.65,
+        "Customer Relationship Status": 0.75
+    }
+}
+
+# Per-applicant overrides of BASE_INFO_VALUE, keyed by stage
+INFO_VALUE_ADJUSTMENTS = {
+    # Minimal adjustments - already strong candidate
+    "strong_applicant": {},
+    # Adjust to focus on clarifying uncertainties
+    "unclear_applicant": {
         "Information Gathering": {
-            "node_count": 25,
-            "relationship_types": ["basic_info", "industry", "loan_request", "financials", "management", "ownership"],
-            "confidence": 0.65
+            "Customer Concentration Details": 0.90,
+            "Industry Forecast": 0.85
         },
         "Risk Assessment": {
-            "node_count": 40,
-            "relationship_types": ["basic_info", "industry", "loan_request", "financials", "management", "ownership", "external_context", "market_position"],
-            "confidence": 0.75
+            "Supply Chain Stability": 0.82,
+            "Competitive Positioning": 0.78
         },
         "Decision Point": {
-            "node_count": 45,
-            "relationship_types": ["basic_info", "industry", "loan_request", "financials", "management", "ownership", "external_context", "market_position", "risk_factors"],
-            "confidence": 0.85
-        },
-        "Monitoring Phase": {
-            "node_count": 55,
-            "relationship_types": ["basic_info", "industry", "loan_request", "financials", "management", "ownership", "external_context", "market_position", "risk_factors", "temporal_patterns"],
-            "confidence": 0.88
+            "Stress Test Scenarios": 0.85
         }
-    }
-    
-    return {
-        "stages": stages,
-        "complexity": stage_complexity
-    }
-
-def generate_next_best_information(applicant_type="strong_applicant"):
-    """Generate next best information recommendations based on applicant type."""
-    
-    # Common information value categories
-    base_info_value = {
-        "Initial Application": {
-            "Financial Statements": 0.85,
-            "Management Background": 0.65,
-            "Customer Contracts": 0.60,
-            "Existing Debt Details": 0.72,
-            "Business Plan": 0.58
-        },
+    },
+    # Adjust to focus on turnaround potential
+    "challenged_applicant": {
         "Information Gathering": {
-            "Industry Forecast": 0.70,
-            "Competitive Analysis": 0.65,
-            "Detailed Cash Flow Projections": 0.82,
-            "Customer Concentration Details": 0.75,
-            "Collateral Valuation": 0.68
+            "Turnaround Plan": 0.92,
+            "Updated Management Structure": 0.88
         },
         "Risk Assessment": {
-            "Supply Chain Stability": 0.60,
-            "Key Personnel Background": 0.55,
-            "Technology Infrastructure": 0.50,
-            "Regulatory Compliance Status": 0.58,
-            "Market Share Trend": 0.65
+            "Cost Reduction Opportunities": 0.85,
+            "Alternative Business Models": 0.80
         },
         "Decision Point": {
-            "Stress Test Scenarios": 0.72,
-            "Risk Mitigation Options": 0.68,
-            "Additional Collateral Options": 0.60,
-            "Reference Checks": 0.52,
-            "Monitoring Plan": 0.75
-        },
-        "Monitoring Phase": {
-            "Updated Financial Statements": 0.88,
-            "Industry News Updates": 0.70,
-            "Payment Pattern Analysis": 0.82,
-            "Management Changes": 0.65,
-            "Customer Relationship Status": 0.75
+            "Additional Collateral Options": 0.88
         }
     }
+}
+
+@functools.lru_cache(maxsize=4)
+def generate_next_best_information(applicant_type="strong_applicant"):
+    """Generate next best information recommendations based on applicant type.
     
-    # Adjust based on applicant type
-    if applicant_type == "strong_applicant":
-        # Minimal adjustments - already strong candidate
-        pass
-    
-    elif applicant_type == "unclear_applicant":
-        # Adjust to focus on clarifying uncertainties
-        base_info_value["Information Gathering"]["Customer Concentration Details"] = 0.90
-        base_info_value["Information Gathering"]["Industry Forecast"] = 0.85
-        base_info_value["Risk Assessment"]["Supply Chain Stability"] = 0.82
-        base_info_value["Risk Assessment"]["Competitive Positioning"] = 0.78
-        base_info_value["Decision Point"]["Stress Test Scenarios"] = 0.85
-    
-    elif applicant_type == "challenged_applicant":
-        # Adjust to focus on turnaround potential
-        base_info_value["Information Gathering"]["Turnaround Plan"] = 0.92
-        base_info_value["Information Gathering"]["Updated Management Structure"] = 0.88
-        base_info_value["Risk Assessment"]["Cost Reduction Opportunities"] = 0.85
-        base_info_value["Risk Assessment"]["Alternative Business Models"] = 0.80
-        base_info_value["Decision Point"]["Additional Collateral Options"] = 0.88
+    Output is cached; callers must not mutate it."""
     
-    return base_info_value
+    # Merge the per-applicant overrides over fresh copies of the shared base values
+    adjustments = INFO_VALUE_ADJUSTMENTS.get(applicant_type, {})
+    return {
+        stage: {**values, **adjustments.get(stage, {})}
+        for stage, values in BASE_INFO_VALUE.items()
+    }
+
+# Recommendation reasoning for each applicant type
+REASONING_PATHS = {
+    "strong_applicant": {
+        "conclusion": "Approve with standard terms",
+        "confidence": 0.85,
+        "reasoning_steps": [
+            ["Strong financial metrics", "Positive industry outlook", "Experienced management team"],
+            ["Growth trend confirmed", "Debt service capacity validated", "Market position verified"]
+        ],
+        "counterfactuals": [
+            "Would change to 'Approve with modified terms' if cash flow decreased by 20%",
+            "Would change to 'Decline' if management team experienced significant turnover",
+            "Would change to 'Request more information' if customer concentration exceeded 25%"
+        ]
+    },
+    "unclear_applicant": {
+        "conclusion": "Approve with additional conditions",
+        "confidence": 0.68,
+        "reasoning_steps": [
+            ["Mixed financial signals", "Industry transition period", "Strong management experience"],
+            ["Modernization plan validated", "Customer concentration risk mitigated", "Collateral value sufficient"]
+        ],
+        "counterfactuals": [
+            "Would change to 'Approve with standard terms' if equipment modernization plan showed 30%+ efficiency gain",
+            "Would change to 'Decline' if raw material costs increased another 20%",
+            "Would change to 'Decline' if largest customer contract was not renewed"
+        ]
+    },
+    "challenged_applicant": {
+        "conclusion": "Decline application",
+        "confidence": 0.82,
+        "reasoning_steps": [
+            ["Declining financial performance", "Industry disruption accelerating", "Recent management turnover"],
+            ["Cash flow insufficient for debt service", "Business model viability concerns", "Insufficient turnaround evidence"]
+        ],
+        "counterfactuals": [
+            "Would change to 'Approve with modified terms' if significant additional collateral was provided",
+            "Would change to 'Approve with conditions' if comprehensive turnaround plan demonstrated viability",
+            "Would change to 'Request more information' if new management team showed successful retail turnarounds"
+        ]
+    }
+}
 
 def generate_reasoning_paths(applicant_type="strong_applicant"):
-    """Generate reasoning paths for recommendations based on applicant type."""
-    
-    if applicant_type == "strong_applicant":
-        reasoning = {
-            "conclusion": "Approve with standard terms",
-            "confidence": 0.85,
-            "reasoning_steps": [
-                ["Strong financial metrics", "Positive industry outlook", "Experienced management team"],
-                ["Growth trend confirmed", "Debt service capacity validated", "Market position verified"]
-            ],
-            "counterfactuals": [
-                "Would change to 'Approve with modified terms' if cash flow decreased by 20%",
-                "Would change to 'Decline' if management team experienced significant turnover",
-                "Would change to 'Request more information' if customer concentration exceeded 25%"
-            ]
-        }
-    
-    elif applicant_type == "unclear_applicant":
-        reasoning = {
-            "conclusion": "Approve with additional conditions",
-            "confidence": 0.68,
-            "reasoning_steps": [
-                ["Mixed financial signals", "Industry transition period", "Strong management experience"],
-                ["Modernization plan validated", "Customer concentration risk mitigated", "Collateral value sufficient"]
-            ],
-            "counterfactuals": [
-                "Would change to 'Approve with standard terms' if equipment modernization plan showed 30%+ efficiency gain",
-                "Would change to 'Decline' if raw material costs increased another 20%",
-                "Would change to 'Decline' if largest customer contract was not renewed"
-            ]
-        }
-    
-    elif applicant_type == "challenged_applicant":
-        reasoning = {
-            "conclusion": "Decline application",
-            "confidence": 0.82,
-            "reasoning_steps": [
-                ["Declining financial performance", "Industry disruption accelerating", "Recent management turnover"],
-                ["Cash flow insufficient for debt service", "Business model viability concerns", "Insufficient turnaround evidence"]
-            ],
-            "counterfactuals": [
-                "Would change to 'Approve with modified terms' if significant additional collateral was provided",
-                "Would change to 'Approve with conditions' if comprehensive turnaround plan demonstrated viability",
-                "Would change to 'Request more information' if new management team showed successful retail turnarounds"
-            ]
-        }
+    """Generate reasoning paths for recommendations based on applicant type.
     
-    return reasoning
+    Returns the shared module-level dict by reference; do not mutate it."""
+    return REASONING_PATHS[applicant_type]
+
+# Confidence component breakdown for each applicant type
+CONFIDENCE_COMPONENTS = {
+    "strong_applicant": {
+        "Financial Data Quality": 0.92,
+        "Management Assessment": 0.88,
+        "Industry Trend Clarity": 0.85,
+        "Market Position Certainty": 0.78,
+        "Temporal Pattern Consistency": 0.90
+    },
+    "unclear_applicant": {
+        "Financial Data Quality": 0.85,
+        "Management Assessment": 0.80,
+        "Industry Trend Clarity": 0.62,
+        "Market Position Certainty": 0.70,
+        "Temporal Pattern Consistency": 0.75
+    },
+    "challenged_applicant": {
+        "Financial Data Quality": 0.78,
+        "Management Assessment": 0.55,
+        "Industry Trend Clarity": 0.88,  # High certainty about negative trends
+        "Market Position Certainty": 0.82,
+        "Temporal Pattern Consistency": 0.85
+    }
+}
 
 def generate_confidence_components(applicant_type="strong_applicant"):
-    """Generate confidence component breakdown based on applicant type."""
+    """Generate confidence component breakdown based on applicant type.
     
-    if applicant_type == "strong_applicant":
-        components = {
-            "Financial Data Quality": 0.92,
-            "Management Assessment": 0.88,
-            "Industry Trend Clarity": 0.85,
-            "Market Position Certainty": 0.78,
-            "Temporal Pattern Consistency": 0.90
-        }
+    Returns the shared module-level dict by reference; do not mutate it."""
+    return CONFIDENCE_COMPONENTS[applicant_type]
+
+def copied(build):
+    """Wrap a memoized builder so each call returns a deep copy the caller may mutate."""
+    return lambda applicant_type: copy.deepcopy(build(applicant_type))
+
+def build_and_save(applicant_type, filename, build):
+    """Build one data file's contents for an applicant type and save it."""
+    save_data(build(applicant_type), filename, applicant_type)
+
+def generate_all_data():
+    """Generate and save all data files for all applicant types.
     
-    elif applicant_type == "unclear_applicant":
-        components = {
-            "Financial Data Quality": 0.85,
-            "Management Assessment": 0.80,
-            "Industry Trend Clarity": 0.62,
-            "Market Position Certainty": 0.70,
-            "Temporal Pattern Consistency": 0.75
-        }
+    Memoized JSON builders are wrapped in copied(), so the saved data never aliases their
+    cached results; the cached tables are only read."""
+    # One scan of the data directory tells which applicant directories exist at all
+    try:
+        with os.scandir(DATA_DIR) as entries:
+            existing_dirs = {entry.name for entry in entries if entry.is_dir()}
+    except FileNotFoundError:
+        existing_dirs = set()
     
-    elif applicant_type == "challenged_applicant":
-        components = {
-            "Financial Data Quality": 0.78,
-            "Management Assessment": 0.55,
-            "Industry Trend Clarity": 0.88,  # High certainty about negative trends
-            "Market Position Certainty": 0.82,
-            "Temporal Pattern Consistency": 0.85
-        }
+    # Directories are only created when the scan shows some are missing
+    if not existing_dirs.issuperset(APPLICANT_TYPES):
+        ensure_data_directories()
     
-    return components
-
-def generate_all_data():
-    """Generate and save all data files for all applicant types."""
-    ensure_data_directories()
+    # Financial series for all applicants come from one batched pass
+    all_financials = generate_all_financials()
     
-    applicant_types = ["strong_applicant", "unclear_applicant", "challenged_applicant"]
+    builders = {
+        "company_profile": generate_company_profile,
+        "financial_data": all_financials.get,
+        "events": generate_events,
+        "risk_scores": generate_risk_scores,
+        "external_context": copied(generate_external_context),
+        "knowledge_graphs": generate_knowledge_graphs,
+        "next_best_information": copied(generate_next_best_information),
+        "reasoning_paths": generate_reasoning_paths,
+        "confidence_components": generate_confidence_components
+    }
+    
+    def build_bundle(applicant_type):
+        return {filename: builders[filename](applicant_type) for filename in BUNDLED_FILES}
     
-    for applicant_type in applicant_types:
-        # Check if data already exists
-        if check_data_exists(applicant_type):
+    tasks = []
+    pending = []
+    for applicant_type in APPLICANT_TYPES:
+        # Check if data already exists; applicants without a directory have nothing to check
+        if applicant_type in existing_dirs and check_data_exists(applicant_type):
             print(f"Data for {applicant_type} already exists. Skipping generation.")
             continue
         
         print(f"Generating data for {applicant_type}...")
+        pending.append(applicant_type)
         
-        # Generate and save all data
-        company_profile = generate_company_profile(applicant_type)
-        save_data(company_profile, "company_profile", applicant_type)
-        
-        financial_data = generate_financial_data(applicant_type)
-        save_data(financial_data, "financial_data", applicant_type)
-        
-        events = generate_events(applicant_type)
-        save_data(events, "events", applicant_type)
-        
-        risk_scores = generate_risk_scores(applicant_type)
-        save_data(risk_scores, "risk_scores", applicant_type)
-        
-        external_context = generate_external_context(applicant_type)
-        save_data(external_context, "external_context", applicant_type)
-        
-        knowledge_graphs = generate_knowledge_graphs(applicant_type)
-        save_data(knowledge_graphs, "knowledge_graphs", applicant_type)
-        
-        next_best_info = generate_next_best_information(applicant_type)
-        save_data(next_best_info, "next_best_information", applicant_type)
-        
-        reasoning_paths = generate_reasoning_paths(applicant_type)
-        save_data(reasoning_paths, "reasoning_paths", applicant_type)
-        
-        confidence_components = generate_confidence_components(applicant_type)
-        save_data(confidence_components, "confidence_components", applicant_type)
+        # Each table is an independent (filename, builder) pair
+        tasks.extend((applicant_type, filename, builders[filename]) for filename in TABLE_FILES)
         
+        # The JSON artefacts are written only together, so they load in one read
+        tasks.append((applicant_type, BUNDLE_FILENAME, build_bundle))
+    
+    # Generate and save all files concurrently; the work is dominated by file writes
+    with ThreadPoolExecutor(max_workers=10) as executor:
+        list(executor.map(lambda task: build_and_save(*task), tasks))
+    
+    for applicant_type in pending:
         print(f"Data generation complete for {applicant_type}.")
     
     print("All data generation complete.")
 
 # Functions to load data at runtime
-def load_applicant_data(applicant_type="strong_applicant"):
-    """Load all data for a specific applicant type."""
+@st.cache_data(show_spinner=False, max_entries=8)
+def read_applicant_data(applicant_type="strong_applicant"):
+    """Read all data for a specific applicant type, raising if any file is missing.
+    
+    Failures propagate instead of returning None so they are never cached."""
     data = {}
     
+    # Read the JSON artefacts from the combined bundle, or file by file for older data
+    if os.path.exists(os.path.join(APPLICANT_DIRS[applicant_type], f"{BUNDLE_FILENAME}.json")):
+        data.update(load_data(BUNDLE_FILENAME, applicant_type))
+    else:
+        for filename in BUNDLED_FILES:
+            data[filename] = load_data(filename, applicant_type)
+    
+    data["financial_data"] = load_data("financial_data", applicant_type, "table")
+    data["risk_scores"] = load_data("risk_scores", applicant_type, "table")
+    
+    # Precompute percent deltas against the first month for metric cards
+    data["financial_deltas"] = compute_percent_deltas(data["financial_data"])
+    
+    # Row dicts of both tables, so graph builders index a plain list instead of DataFrame rows
+    data["financial_records"] = frame_records(data["financial_data"])
+    data["risk_records"] = frame_records(data["risk_scores"])
+    
+    # Precompute impacts of active context sources so pages don't redo it per rerun
+    data["active_context_impacts"] = {
+        source: source_data.get("impact", 0)
+        for source, source_data in data["external_context"].items()
+        if source_data.get("active", False)
+    }
+    
+    return data
+
+def load_applicant_data(applicant_type="strong_applicant"):
+    """Load all data for a specific applicant type, or None if it is unavailable."""
     try:
-        data["company_profile"] = load_data("company_profile", applicant_type)
-        data["financial_data"] = load_data("financial_data", applicant_type, "csv")
-        data["events"] = load_data("events", applicant_type)
-        data["risk_scores"] = load_data("risk_scores", applicant_type, "csv")
-        data["external_context"] = load_data("external_context", applicant_type)
-        data["knowledge_graphs"] = load_data("knowledge_graphs", applicant_type)
-        data["next_best_information"] = load_data("next_best_information", applicant_type)
-        data["reasoning_paths"] = load_data("reasoning_paths", applicant_type)
-        data["confidence_components"] = load_data("confidence_components", applicant_type)
-        
-        return data
+        return read_applicant_data(applicant_type)
     except Exception as e:
         print(f"Error loading data for {applicant_type}: {e}")
         return None
 
+# Signal library for the signal amplification demo; read-only and shared by all callers
+SIGNAL_LIBRARY = MappingProxyType({
+    "Company Signals": (
+        "Revenue Decline",
+        "Margin Pressure",
+        "Cash Flow Reduction",
+        "Management Turnover",
+        "Inventory Buildup",
+        "Delayed Financial Filing"
+    ),
+    "Industry Signals": (
+        "Industry Slowdown",
+        "Competitor Struggles",
+        "Supply Chain Disruption",
+        "Technology Shift",
+        "Regulatory Changes",
+        "Market Saturation"
+    ),
+    "Economic Signals": (
+        "Interest Rate Increase",
+        "Consumer Confidence Drop",
+        "Credit Market Tightening",
+        "Currency Fluctuations",
+        "Inflation Acceleration",
+        "Employment Trend Change"
+    )
+})
+
 def get_signal_library():
     """Return the signal library for signal amplification demo."""
-    return {
-        "Company Signals": [
-            "Revenue Decline",
-            "Margin Pressure",
-            "Cash Flow Reduction",
-            "Management Turnover",
-            "Inventory Buildup",
-            "Delayed Financial Filing"
-        ],
-        "Industry Signals": [
-            "Industry Slowdown",
-            "Competitor Struggles",
-            "Supply Chain Disruption",
-            "Technology Shift",
-            "Regulatory Changes",
-            "Market Saturation"
-        ],
-        "Economic Signals": [
-            "Interest Rate Increase",
-            "Consumer Confidence Drop",
-            "Credit Market Tightening",
-            "Currency Fluctuations",
-            "Inflation Acceleration",
-            "Employment Trend Change"
-        ]
-    }
+    return SIGNAL_LIBRARY
 
 # If this module is run directly, generate all data
 if __name__ == "__main__":
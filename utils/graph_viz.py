@@ -1,105 +1,228 @@
 # utils/graph_viz.py
 import streamlit as st
 import networkx as nx
-import plotly.graph_objects as go
-from pyvis.network import Network
+import numpy as np
 import streamlit.components.v1 as components
-import tempfile
-import os
 from utils.theme import COLORS
 
+# Graphs with more nodes than this are rendered without memoizing their HTML
+MAX_CACHED_GRAPH_NODES = 5000
+
 def create_pyvis_graph(G, height=500, width=None, notebook=False, 
                        bgcolor=COLORS['bg_dark'], font_color=COLORS['text_primary']):
     """Convert NetworkX graph to PyVis interactive visualization."""
     if width is None:
         width = "100%"
     
-    # Create PyVis network
-    net = Network(height=f"{height}px", width=width, notebook=notebook, 
-                 bgcolor=bgcolor, font_color=font_color)
+    html = pyvis_graph_html(G, height, width, notebook, bgcolor, font_color)
     
-    # Copy node attributes from NetworkX
-    for node, node_attrs in G.nodes(data=True):
-        size = node_attrs.get('size', 25)
-        title = node_attrs.get('title', str(node))
-        color = node_attrs.get('color', COLORS['node_default'])
-        shape = node_attrs.get('shape', 'dot')
-        
-        net.add_node(str(node), title=title, color=color, size=size, shape=shape, label=str(node))
+    # Return HTML component
+    return components.html(html, height=height, width=width)
+
+def create_pyvis_graph_from_lists(nodes, edges, height=500, width=None, notebook=False, 
+                                  bgcolor=COLORS['bg_dark'], font_color=COLORS['text_primary']):
+    """Render PyVis node and edge tuples directly, without a NetworkX graph."""
+    if width is None:
+        width = "100%"
+    
+    html = pyvis_html_from_lists(nodes, edges, height, width, notebook, bgcolor, font_color)
+    
+    # Return HTML component
+    return components.html(html, height=height, width=width)
+
+def pyvis_graph_html(G, height=500, width=None, notebook=False, 
+                     bgcolor=COLORS['bg_dark'], font_color=COLORS['text_primary']):
+    """Generate the PyVis HTML for a NetworkX graph without rendering it."""
+    # Copy node attributes from NetworkX, one bulk accessor per attribute
+    nodes = tuple(
+        (str(node), size, color, str(node) if title is None else title, shape)
+        for (node, size), (_, color), (_, title), (_, shape) in zip(
+            G.nodes(data='size', default=25),
+            G.nodes(data='color', default=COLORS['node_default']),
+            G.nodes(data='title'),
+            G.nodes(data='shape', default='dot')
+        )
+    )
     
     # Copy edge attributes from NetworkX
-    for source, target, edge_attrs in G.edges(data=True):
-        width = edge_attrs.get('width', 1)
-        color = edge_attrs.get('color', COLORS['edge_default'])
-        title = edge_attrs.get('title', '')
+    edges = tuple(
+        (str(source), str(target), width, color, title)
+        for (source, target, width), (_, _, color), (_, _, title) in zip(
+            G.edges(data='width', default=1),
+            G.edges(data='color', default=COLORS['edge_default']),
+            G.edges(data='title', default='')
+        )
+    )
+    
+    # Very large graphs would bloat the memo store, so they bypass the caches entirely,
+    # including the cached server-side layout; vis.js physics lays them out in the browser
+    if len(nodes) > MAX_CACHED_GRAPH_NODES:
+        return build_pyvis_html(nodes, edges, height, width, notebook, bgcolor, font_color,
+                                static_layout=False)
+    return pyvis_html_from_lists(nodes, edges, height, width, notebook, bgcolor, font_color)
+
+def layout_positions(node_ids, edge_pairs, scale=1000, algorithm="forceatlas2"):
+    """
+    Compute node positions on the server, without caching.
+    
+    The default uses ForceAtlas2 with Barnes-Hut optimization when this NetworkX
+    version provides it, otherwise a seeded spring layout.
+    
+    Args:
+        node_ids: Tuple of node ids
+        edge_pairs: Tuple of (source, target) tuples
+        scale: Multiplier applied to the unit-square coordinates
+        algorithm: "forceatlas2", or "spring" for a seeded spring layout
         
-        net.add_edge(str(source), str(target), width=width, color=color, title=title)
+    Returns:
+        Dictionary mapping node id to (x, y) in PyVis pixel coordinates
+    """
+    G = nx.Graph()
+    G.add_nodes_from(node_ids)
+    G.add_edges_from(edge_pairs)
     
-    # Apply physics layout options
-    net.toggle_physics(True)
-    net.barnes_hut(spring_length=200, spring_strength=0.01, damping=0.09)
+    if algorithm == "forceatlas2" and hasattr(nx, "forceatlas2_layout"):
+        pos = nx.forceatlas2_layout(G, seed=42, max_iter=50, strong_gravity=True)
+        pos = nx.rescale_layout_dict(pos)
+    else:
+        pos = nx.spring_layout(G, seed=42, iterations=50)
     
-    # Save and read graph as HTML
-    with tempfile.NamedTemporaryFile(suffix='.html', delete=False) as temp:
-        path = temp.name
-        net.save_graph(path)
+    return {node: (float(x) * scale, float(y) * scale) for node, (x, y) in pos.items()}
+
+# Cached variant keyed on the node and edge lists, so reruns with an identical
+# graph reuse the positions
+compute_static_layout = st.cache_data(max_entries=64)(layout_positions)
+
+def graph_spring_layout(G):
+    """Return a seeded spring layout in unit coordinates, cached unless the graph is very large."""
+    layout = compute_static_layout if G.number_of_nodes() <= MAX_CACHED_GRAPH_NODES else layout_positions
+    return layout(tuple(G.nodes()), tuple(G.edges()), scale=1, algorithm="spring")
+
+def build_pyvis_html(nodes, edges, height=500, width=None, notebook=False, 
+                     bgcolor=COLORS['bg_dark'], font_color=COLORS['text_primary'],
+                     static_layout=True):
+    """
+    Generate PyVis HTML straight from node and edge tuples, without caching.
     
-    # Load HTML into a string
-    with open(path, 'r', encoding='utf-8') as f:
-        html = f.read()
+    Args:
+        nodes: Tuple of (id, size, color, title, shape) tuples
+        edges: Tuple of (source, target, width, color, title) tuples, optionally
+            followed by a dashes flag for edges drawn as dashed lines
+        static_layout: If True, place nodes at server-computed positions and
+            disable browser-side physics
+    """
+    from pyvis.network import Network
     
-    # Clean up temporary file
-    try:
-        os.unlink(path)
-    except:
-        pass
+    if width is None:
+        width = "100%"
     
-    # Return HTML component
-    return components.html(html, height=height, width=width)
+    # Create PyVis network
+    net = Network(height=f"{height}px", width=width, notebook=notebook, 
+                 bgcolor=bgcolor, font_color=font_color)
+    
+    if static_layout:
+        pos = compute_static_layout(tuple(node[0] for node in nodes),
+                                    tuple((edge[0], edge[1]) for edge in edges))
+        for node_id, size, color, title, shape in nodes:
+            x, y = pos[node_id]
+            net.add_node(node_id, title=title, color=color, size=size, shape=shape, 
+                         label=node_id, x=x, y=y, physics=False)
+    else:
+        for node_id, size, color, title, shape in nodes:
+            net.add_node(node_id, title=title, color=color, size=size, shape=shape, label=node_id)
+    
+    for source, target, edge_width, color, title, *dashes in edges:
+        net.add_edge(source, target, width=edge_width, color=color, title=title, 
+                     dashes=bool(dashes and dashes[0]))
+    
+    # Apply physics layout options
+    if static_layout:
+        net.toggle_physics(False)
+    else:
+        net.toggle_physics(True)
+        net.barnes_hut(spring_length=200, spring_strength=0.01, damping=0.09)
+        
+        # Stop the solver soon after the initial stabilization so pan/zoom does not re-layout
+        net.options.physics.stabilization.iterations = 50
+        net.options.physics.stabilization.fit = True
+        net.options.physics.minVelocity = 0.75
+    
+    # Generate the HTML in memory
+    html = net.generate_html(notebook=notebook)
+    
+    return html
+
+# Cached variant keyed on the node and edge tuples, so reruns with an identical
+# graph skip the PyVis setup and templating entirely
+pyvis_html_from_lists = st.cache_data(max_entries=32)(build_pyvis_html)
 
 # In utils/graph_viz.py, update the simplified_graph_viz function:
 
+@st.cache_resource
+def graph_layout_base():
+    """Return the shared dark-theme Plotly layout used by the graph fallbacks."""
+    import plotly.graph_objects as go
+    
+    # go.Figure copies the layout it is given, so sharing one instance is safe
+    return go.Layout(
+        showlegend=False,
+        hovermode='closest',
+        margin=dict(b=20, l=5, r=5, t=40),
+        xaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
+        yaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
+        paper_bgcolor=COLORS['bg_dark'],
+        plot_bgcolor=COLORS['bg_dark'],
+        font=dict(color=COLORS['text_primary'])
+    )
+
 def simplified_graph_viz(G, height=500, width=700):
     """Create a simplified graph visualization using Plotly.
     Use this as a fallback if PyVis has issues."""
     
-    # Create a spring layout
-    pos = nx.spring_layout(G, seed=42)
+    import plotly.graph_objects as go
+    
+    # Create a spring layout, reused across reruns for the same graph
+    pos = graph_spring_layout(G)
     
-    # Create edge traces
+    # Group edge endpoints by line style so each style is drawn as one trace
+    edge_groups = {}
+    edge_color = COLORS['edge_default']
+    for source, target, attrs in G.edges(data=True):
+        style = (attrs.get('color', edge_color), attrs.get('width', 1))
+        edge_groups.setdefault(style, []).append((pos[source], pos[target]))
+    
+    # Create edge traces, with segments separated by NaN breaks: x0, x1, nan, x0, x1, nan, ...
     edge_traces = []
-    for edge in G.edges(data=True):
-        source, target = edge[0], edge[1]
-        x0, y0 = pos[source]
-        x1, y1 = pos[target]
-        
-        width = edge[2].get('width', 1)
-        color = edge[2].get('color', COLORS['edge_default'])
+    for (color, edge_width), segments in edge_groups.items():
+        ends = np.asarray(segments, dtype=np.float32)  # (n, 2 endpoints, 2 coords)
+        xs = np.full(3 * len(segments), np.nan, dtype=np.float32)
+        ys = np.full(3 * len(segments), np.nan, dtype=np.float32)
+        xs[0::3], xs[1::3] = ends[:, 0, 0], ends[:, 1, 0]
+        ys[0::3], ys[1::3] = ends[:, 0, 1], ends[:, 1, 1]
         
-        edge_trace = go.Scatter(
-            x=[x0, x1, None],
-            y=[y0, y1, None],
-            line=dict(width=width, color=color),
+        edge_traces.append(go.Scattergl(
+            x=xs,
+            y=ys,
+            line=dict(width=edge_width, color=color),
             hoverinfo='none',
             mode='lines'
-        )
-        edge_traces.append(edge_trace)
+        ))
     
     # Create node trace
-    node_x = []
-    node_y = []
+    # Preallocate coordinate arrays; attribute lists are filled in the same pass
+    node_x = np.empty(G.number_of_nodes(), dtype=np.float32)
+    node_y = np.empty(G.number_of_nodes(), dtype=np.float32)
     node_colors = []
     node_sizes = []
     node_text = []
     node_labels = []
     
-    for node, attrs in G.nodes(data=True):
-        x, y = pos[node]
-        node_x.append(x)
-        node_y.append(y)
+    default_color = COLORS['node_default']
+    for i, (node, attrs) in enumerate(G.nodes(data=True)):
+        node_x[i], node_y[i] = pos[node]
         
         # Get node attributes
-        color = attrs.get('color', COLORS['node_default'])
+        color = attrs.get('color', default_color)
         size = attrs.get('size', 15)
         title = attrs.get('title', str(node))
         
@@ -113,8 +236,8 @@ def simplified_graph_viz(G, height=500, width=700):
             label = label[:18] + "..."
         node_labels.append(label)
     
-    # Create node trace
-    node_trace = go.Scatter(
+    # Create node trace; edges and markers render through WebGL, labels stay SVG text
+    node_trace = go.Scattergl(
         x=node_x, y=node_y,
         mode='markers',
         marker=dict(
@@ -141,25 +264,9 @@ def simplified_graph_viz(G, height=500, width=700):
         hoverinfo='none'
     )
     
-    # Create figure
-    fig = go.Figure(
-        data=edge_traces + [node_trace, text_trace],
-        layout=go.Layout(
-            showlegend=False,
-            hovermode='closest',
-            margin=dict(b=20, l=5, r=5, t=40),
-            xaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
-            yaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
-            width=width,
-            height=height,
-            paper_bgcolor=COLORS['bg_dark'],
-            plot_bgcolor=COLORS['bg_dark'],
-            font=dict(color=COLORS['text_primary'])
-        )
-    )
-    
-    # Add title
-    fig.update_layout(title="Knowledge Graph Visualization")
+    # Create figure from the shared base layout, then apply the per-call settings
+    fig = go.Figure(data=edge_traces + [node_trace, text_trace], layout=graph_layout_base())
+    fig.update_layout(width=width, height=height, title="Knowledge Graph Visualization")
     
     return st.plotly_chart(fig, use_container_width=True)
 
@@ -191,42 +298,28 @@ def networkx_matplotlib_graph(G, height=500, width=700):
     This is a very reliable fallback visualization method.
     """
     import matplotlib.pyplot as plt
-    import io
-    from PIL import Image
     
     # Create figure with the right background color
     fig, ax = plt.subplots(figsize=(10, 8))
     fig.patch.set_facecolor('#0F172A')  # Dark background
     ax.set_facecolor('#0F172A')  # Dark background
     
-    # Create a spring layout
-    pos = nx.spring_layout(G, seed=42)
-    
-    # Collect node attributes
-    node_sizes = []
-    node_colors = []
+    # Create a spring layout, reused across reruns for the same graph
+    pos = graph_spring_layout(G)
     
-    for node in G.nodes():
-        # Get size or use default
-        size = G.nodes[node].get('size', 15)
-        node_sizes.append(size * 20)  # Scale up for matplotlib
-        
-        # Get color or use default
-        color = G.nodes[node].get('color', COLORS['node_default'])
-        node_colors.append(color)
+    # Collect node and edge attributes in one walk each, then scale sizes as an array
+    default_node_color = COLORS['node_default']
+    default_edge_color = COLORS['edge_default']
     
-    # Collect edge attributes
-    edge_widths = []
-    edge_colors = []
+    node_data = G.nodes(data=True)
+    node_sizes = np.fromiter((attrs.get('size', 15) for _, attrs in node_data), 
+                             dtype=np.float32, count=len(node_data)) * 20  # Scale up for matplotlib
+    node_colors = [attrs.get('color', default_node_color) for _, attrs in node_data]
     
-    for u, v, data in G.edges(data=True):
-        # Get width or use default
-        width = data.get('width', 1)
-        edge_widths.append(width)
-        
-        # Get color or use default
-        color = data.get('color', COLORS['edge_default'])
-        edge_colors.append(color)
+    edge_data = G.edges(data=True)
+    edge_widths = np.fromiter((attrs.get('width', 1) for _, _, attrs in edge_data), 
+                              dtype=np.float32, count=len(edge_data))
+    edge_colors = [attrs.get('color', default_edge_color) for _, _, attrs in edge_data]
     
     # Draw the edges
     nx.draw_networkx_edges(
@@ -256,15 +349,9 @@ def networkx_matplotlib_graph(G, height=500, width=700):
     # Turn off axis
     plt.axis('off')
     
-    # Save to buffer
-    buf = io.BytesIO()
+    # Hand the figure straight to Streamlit
     plt.tight_layout()
-    plt.savefig(buf, format='png', dpi=100, bbox_inches='tight')
-    buf.seek(0)
-    
-    # Display the image
+    st.pyplot(fig, use_container_width=True)
     plt.close(fig)  # Close the figure to free memory
-    image = Image.open(buf)
-    st.image(image, use_container_width=True)
     
     return
\ No newline at end of file
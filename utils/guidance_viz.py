@@ -1,17 +1,151 @@
 # utils/guidance_viz.py
 import streamlit as st
-import pandas as pd
-import networkx as nx
-import plotly.graph_objects as go
-from utils.theme import COLORS
-from utils.graph_viz import create_pyvis_graph
+import streamlit.components.v1 as components
+import functools
+from bisect import bisect_right
+import numpy as np
+from string import Template
+from utils.theme import COLORS, dark_layout_template
+from utils.graph_viz import build_pyvis_html
 
-def create_reasoning_path_graph(reasoning_steps, conclusion):
-    """Create a graph showing the reasoning path to a recommendation."""
-    G = nx.DiGraph()
+# Plotly config for the guidance charts; they are read-only, so the mode bar is hidden
+CHART_CONFIG = {"displayModeBar": False}
+
+# Lower bounds of the medium and high confidence buckets, with each bucket's color and label
+CONFIDENCE_THRESHOLDS = (0.5, 0.8)
+CONFIDENCE_BUCKET_COLORS = (COLORS['low_confidence'], COLORS['medium_confidence'], COLORS['high_confidence'])
+CONFIDENCE_BUCKET_LABELS = ("Low Confidence", "Medium Confidence", "High Confidence")
+
+# Static inputs for each decision context in the adaptive guidance demo
+GUIDANCE_CONTEXTS = {
+    "Loan Application Assessment": {
+        "info_values": {
+            "Industry Growth Forecast": 0.78,
+            "Customer Concentration Details": 0.65,
+            "Management Team Background": 0.52,
+            "Detailed Cash Flow Projections": 0.87,
+            "Competitor Performance Data": 0.41
+        },
+        "reasoning_steps": (
+            ("Strong financial metrics", "Positive industry outlook", "Acceptable collateral value"),
+            ("Profitability meets threshold", "Debt service capacity confirmed", "Market position validation")
+        ),
+        "conclusion": "Approve with standard terms",
+        "confidence": 0.76,
+        "confidence_components": {
+            "Financial Data Quality": 0.88,
+            "Industry Trend Clarity": 0.72,
+            "Market Position Certainty": 0.65,
+            "Management Assessment": 0.81,
+            "Collateral Valuation": 0.79
+        },
+        "recommendation_title": "Approve the loan application with standard terms",
+        "recommendation_content": "Based on strong financial metrics, positive industry outlook, and acceptable collateral value, we recommend approving this loan with our standard terms and monitoring frequency.",
+        "counterfactuals": """
+        The recommendation would change to "Approve with modified terms" if:
+        - Debt service coverage ratio fell below 1.2
+        - Industry outlook showed increased volatility
+        - Customer concentration exceeded 30% with a single client
+        
+        The recommendation would change to "Decline" if:
+        - Cash flow projections showed insufficient coverage
+        - Management team had recent significant turnover
+        - Collateral valuation decreased by more than 15%
+        """
+    },
+    "Monitoring Phase Alert": {
+        "info_values": {
+            "Updated Financial Statements": 0.92,
+            "Recent Management Changes": 0.44,
+            "Industry News Events": 0.62,
+            "Customer Payment Patterns": 0.75,
+            "Market Share Trends": 0.38
+        },
+        "reasoning_steps": (
+            ("Delayed payments detected", "Industry downturn signals", "Competitive pressure increasing"),
+            ("Cash flow deterioration trend", "Risk level increasing")
+        ),
+        "conclusion": "Increase monitoring frequency",
+        "confidence": 0.82,
+        "confidence_components": {
+            "Payment Data Reliability": 0.95,
+            "Industry Trend Clarity": 0.82,
+            "Competitive Intelligence": 0.71,
+            "Financial Statement Recency": 0.88,
+            "Historical Pattern Matching": 0.75
+        },
+        "recommendation_title": "Increase monitoring frequency and request updated financials",
+        "recommendation_content": "Recent payment delays combined with industry downturn signals suggest increased risk. We recommend increasing monitoring frequency from quarterly to monthly and requesting updated financial statements immediately.",
+        "counterfactuals": """
+        The recommendation would change to "Initiate loss mitigation" if:
+        - Payment delays exceeded 60 days
+        - Updated financials showed negative EBITDA
+        - Major customer loss was reported
+        
+        The recommendation would change to "Return to normal monitoring" if:
+        - Payment pattern returned to consistent on-time payments
+        - Industry indicators stabilized
+        - Updated financials showed strong liquidity position
+        """
+    },
+    "Term Modification Request": {
+        "info_values": {
+            "Cash Flow Timing Analysis": 0.85,
+            "Industry Seasonality Data": 0.73,
+            "Supply Chain Disruption Impact": 0.68,
+            "Updated Collateral Valuation": 0.47,
+            "Customer Contract Renewal Rates": 0.56
+        },
+        "reasoning_steps": (
+            ("Seasonal cash flow pattern confirmed", "Strong historical payment performance", "Industry-wide timing shift"),
+            ("Payment timing misalignment", "Underlying business remains sound")
+        ),
+        "conclusion": "Approve payment schedule adjustment",
+        "confidence": 0.68,
+        "confidence_components": {
+            "Cash Flow Analysis Quality": 0.84,
+            "Seasonality Pattern Clarity": 0.92,
+            "Payment History Completeness": 0.76,
+            "Market Condition Assessment": 0.62,
+            "Customer Relationship Stability": 0.69
+        },
+        "recommendation_title": "Approve payment schedule adjustment",
+        "recommendation_content": "The analysis confirms seasonal cash flow patterns typical for this industry. With the strong historical payment performance, we recommend approving the requested payment schedule adjustment to align with their business cycle.",
+        "counterfactuals": """
+        The recommendation would change to "Approve with additional conditions" if:
+        - Seasonal pattern was less pronounced than reported
+        - Recent payment history showed occasional delays
+        - Industry peers were not experiencing similar timing issues
+        
+        The recommendation would change to "Decline modification" if:
+        - Cash flow analysis revealed fundamental shortfalls
+        - Customer concentration had increased significantly
+        - Management provided inconsistent explanation for timing issues
+        """
+    }
+}
+
+def create_reasoning_path_nodes(reasoning_steps, conclusion, edge_strategy="positional"):
+    """
+    Build PyVis-ready node and edge tuples for the reasoning path to a recommendation.
+    
+    Args:
+        reasoning_steps: Sequence of levels, each a sequence of reasoning items
+        conclusion: Label of the conclusion node
+        edge_strategy: "positional" links each node to the node at the same position
+            (wrapping) in the level above, "to_root" links every node to the conclusion,
+            and "bipartite" links each node to every node in the level above
+        
+    Returns:
+        Tuple of (nodes, edges), where nodes are (id, size, color, title, shape)
+        tuples and edges are (source, target, width, color, title) tuples
+    """
+    step_color = COLORS['primary']
+    edge_color = COLORS['edge_default']
     
     # Add conclusion node
-    G.add_node(conclusion, size=25, color=COLORS['guidance'], title=conclusion, shape='star')
+    nodes = [(conclusion, 25, COLORS['guidance'], conclusion, 'star')]
+    edges = []
     
     # Track previous level nodes for connections
     previous_level = [conclusion]
@@ -26,75 +160,116 @@ def create_reasoning_path_graph(reasoning_steps, conclusion):
             node_name = f"{item} (L{len(reasoning_steps)-i})"
             
             # Add node
-            G.add_node(node_name, size=15, color=COLORS['primary'], title=item, shape='dot')
+            nodes.append((node_name, 15, step_color, item, 'dot'))
             current_level.append(node_name)
             
-            # Connect to all nodes in the previous level
-            for prev_node in previous_level:
-                G.add_edge(node_name, prev_node, width=2, color=COLORS['edge_default'])
+            # Connect to the previous level according to the edge strategy
+            if edge_strategy == "bipartite":
+                edges.extend((node_name, prev_node, 2, edge_color, '') for prev_node in previous_level)
+            elif edge_strategy == "to_root":
+                edges.append((node_name, conclusion, 2, edge_color, ''))
+            else:
+                edges.append((node_name, previous_level[j % len(previous_level)], 2, edge_color, ''))
         
         # Update previous level
         previous_level = current_level
     
+    return tuple(nodes), tuple(edges)
+
+# Reasoning path nodes and edges for each decision context, built once at import
+REASONING_PATH_ELEMENTS = {
+    decision_context: create_reasoning_path_nodes(context["reasoning_steps"], context["conclusion"])
+    for decision_context, context in GUIDANCE_CONTEXTS.items()
+}
+
+@functools.lru_cache(maxsize=None)
+def reasoning_path_html(decision_context):
+    """Serialize the PyVis HTML for a decision context's reasoning path, once per process."""
+    nodes, edges = REASONING_PATH_ELEMENTS[decision_context]
+    return build_pyvis_html(nodes, edges, height=400)
+
+def create_reasoning_path_graph(reasoning_steps, conclusion, edge_strategy="positional"):
+    """Create a graph showing the reasoning path to a recommendation.
+    
+    Only needed by callers that run graph algorithms; rendering can use the
+    tuples from create_reasoning_path_nodes directly."""
+    import networkx as nx
+    
+    nodes, edges = create_reasoning_path_nodes(reasoning_steps, conclusion, edge_strategy)
+    
+    G = nx.DiGraph()
+    G.add_nodes_from(
+        (node_id, {"size": size, "color": color, "title": title, "shape": shape})
+        for node_id, size, color, title, shape in nodes
+    )
+    G.add_edges_from(
+        (source, target, {"width": width, "color": color})
+        for source, target, width, color, _ in edges
+    )
+    
     return G
 
-def information_value_visualization(info_values, height=400):
-    """Create a visualization of information value calculation."""
-    # Create figure
-    fig = go.Figure()
+@st.cache_data(max_entries=16)
+def build_information_value_figure(info_items, height=400):
+    """Build the information value figure from a tuple of (info, value) pairs."""
+    import plotly.graph_objects as go
     
-    # Sort by value for better visualization
-    sorted_items = sorted(info_values.items(), key=lambda x: x[1], reverse=True)
-    
-    # Add bars for information value
-    for info, value in sorted_items:
-        # Determine color based on value
-        if value >= 0.8:
-            color = COLORS['high_confidence']
-        elif value >= 0.5:
-            color = COLORS['medium_confidence']
-        else:
-            color = COLORS['low_confidence']
-        
-        # Add bar
-        fig.add_trace(go.Bar(
-            x=[value],
-            y=[info],
-            orientation='h',
-            marker_color=color,
-            name=info,
-            hovertemplate='<b>%{y}</b><br>Value: %{x:.2f}'
-        ))
+    infos = np.array([info for info, _ in info_items], dtype=object)
+    values = np.fromiter((value for _, value in info_items), dtype=np.float64, count=len(info_items))
+    
+    # Sort by value for better visualization; a stable sort keeps ties in input order
+    order = np.argsort(-values, kind='stable')
+    
+    # Determine color based on value
+    colors = np.array(CONFIDENCE_BUCKET_COLORS)[
+        np.searchsorted(CONFIDENCE_THRESHOLDS, values, side='right')
+    ]
+    
+    # Create figure with a single trace holding every bar
+    fig = go.Figure(go.Bar(
+        x=values[order],
+        y=infos[order],
+        orientation='h',
+        marker_color=colors[order],
+        hovertemplate='<b>%{y}</b><br>Value: %{x:.2f}<extra></extra>'
+    ))
     
     # Update layout for dark theme
     fig.update_layout(
-        paper_bgcolor=COLORS['bg_dark'],
-        plot_bgcolor=COLORS['bg_dark'],
-        font_color=COLORS['text_primary'],
+        template=dark_layout_template(),
         title="Information Value Analysis",
+        showlegend=False,
         xaxis_title="Expected Value of Information",
         yaxis_title="Information Type",
         height=height,
         xaxis=dict(
-            gridcolor=COLORS['bg_light'],
             range=[0, 1]
-        ),
-        yaxis=dict(
-            gridcolor=COLORS['bg_light']
         )
     )
     
     return fig
 
-def confidence_breakdown_radar(confidence_components, height=400):
-    """Create a radar chart showing confidence breakdown."""
+def information_value_visualization(info_values, height=400):
+    """Create a visualization of information value calculation."""
+    return build_information_value_figure(tuple(info_values.items()), height)
+
+@st.cache_data(max_entries=16)
+def build_confidence_radar_figure(component_items, height=400):
+    """Build the confidence radar figure from a tuple of (component, confidence) pairs."""
+    import plotly.graph_objects as go
+    
+    # Split the pairs in one pass, repeating the first point to close the polygon
+    theta, r = map(list, zip(*component_items))
+    theta.append(theta[0])
+    r.append(r[0])
+    
     # Create figure
     fig = go.Figure()
     
     # Add radar chart
     fig.add_trace(go.Scatterpolar(
-        r=list(confidence_components.values()),
-        theta=list(confidence_components.keys()),
+        r=r,
+        theta=theta,
         fill='toself',
         name='Confidence Components',
         line_color=COLORS['primary']
@@ -102,61 +277,76 @@ def confidence_breakdown_radar(confidence_components, height=400):
     
     # Update layout for dark theme
     fig.update_layout(
-        paper_bgcolor=COLORS['bg_dark'],
-        plot_bgcolor=COLORS['bg_dark'],
-        font_color=COLORS['text_primary'],
+        template=dark_layout_template(),
         title="Confidence Component Analysis",
+        showlegend=False,
         height=height,
         polar=dict(
             radialaxis=dict(
                 visible=True,
-                range=[0, 1],
-                gridcolor=COLORS['bg_light']
-            ),
-            angularaxis=dict(
-                gridcolor=COLORS['bg_light']
-            ),
-            bgcolor=COLORS['bg_dark']
+                range=[0, 1]
+            )
         )
     )
     
     return fig
 
-def recommendation_card(title, content, confidence=0.5):
-    """Create a styled recommendation card."""
-    # Determine color based on confidence
-    if confidence >= 0.8:
-        border_color = COLORS['high_confidence']
-        confidence_text = "High Confidence"
-    elif confidence >= 0.5:
-        border_color = COLORS['medium_confidence']
-        confidence_text = "Medium Confidence"
-    else:
-        border_color = COLORS['low_confidence']
-        confidence_text = "Low Confidence"
-    
-    # Create HTML for the card
-    st.markdown(f"""
-    <div style="border-left: 4px solid {border_color}; 
-                background-color: {COLORS['bg_medium']}; 
+def confidence_breakdown_radar(confidence_components, height=400):
+    """Create a radar chart showing confidence breakdown."""
+    return build_confidence_radar_figure(tuple(confidence_components.items()), height)
+
+# Recommendation card markup; the theme colors are filled in once at import
+RECOMMENDATION_CARD_TEMPLATE = Template(Template("""
+    <div style="border-left: 4px solid $border_color; 
+                background-color: $bg_medium; 
                 border-radius: 4px; 
                 padding: 15px; 
                 margin-bottom: 15px;">
-        <h4 style="color: {COLORS['text_primary']}; margin-top: 0;">{title}</h4>
-        <p style="color: {COLORS['text_primary']};">{content}</p>
+        <h4 style="color: $text_primary; margin-top: 0;">$title</h4>
+        <p style="color: $text_primary;">$content</p>
         <div style="display: flex; align-items: center;">
-            <div style="background: linear-gradient(to right, {border_color} {confidence*100}%, {COLORS['bg_light']} {confidence*100}%); 
+            <div style="background: linear-gradient(to right, $border_color $percent%, $bg_light $percent%); 
                         height: 8px; 
                         width: 100px; 
                         border-radius: 4px; 
                         margin-right: 10px;"></div>
-            <span style="color: {COLORS['text_secondary']}; font-size: 0.8em;">{confidence_text} ({confidence:.2f})</span>
+            <span style="color: $text_secondary; font-size: 0.8em;">$confidence_label</span>
         </div>
     </div>
-    """, unsafe_allow_html=True)
+    """).safe_substitute(
+    bg_medium=COLORS['bg_medium'],
+    bg_light=COLORS['bg_light'],
+    text_primary=COLORS['text_primary'],
+    text_secondary=COLORS['text_secondary']
+))
+
+@functools.lru_cache(maxsize=32)
+def recommendation_card_html(title, content, confidence=0.5):
+    """Build the HTML for a styled recommendation card."""
+    # Determine color based on confidence
+    bucket = bisect_right(CONFIDENCE_THRESHOLDS, confidence)
+    border_color = CONFIDENCE_BUCKET_COLORS[bucket]
+    confidence_text = CONFIDENCE_BUCKET_LABELS[bucket]
+    
+    # Fill the card template; the confidence percentage appears twice but is computed once
+    return RECOMMENDATION_CARD_TEMPLATE.substitute(
+        title=title,
+        content=content,
+        border_color=border_color,
+        percent=confidence * 100,
+        confidence_label=f"{confidence_text} ({confidence:.2f})"
+    )
 
+def recommendation_card(title, content, confidence=0.5):
+    """Create a styled recommendation card."""
+    st.markdown(recommendation_card_html(title, content, confidence), unsafe_allow_html=True)
+
+@st.fragment
 def adaptive_guidance_demo():
-    """Create a complete adaptive guidance demonstration."""
+    """Create a complete adaptive guidance demonstration.
+    
+    Runs as a fragment, whose return value Streamlit discards on fragment reruns, so
+    the selected context is kept in st.session_state["last_guidance_ctx"] instead."""
     st.write("### Adaptive Guidance System")
     
     st.write("""
@@ -169,162 +359,54 @@ def adaptive_guidance_demo():
     # Decision context selection
     decision_context = st.selectbox(
         "Select a decision context:",
-        ["Loan Application Assessment", "Monitoring Phase Alert", "Term Modification Request"]
+        list(GUIDANCE_CONTEXTS.keys())
     )
+    context = GUIDANCE_CONTEXTS[decision_context]
+    
+    # Rebuild the figures and graph HTML only when the decision context changed
+    if st.session_state.get("last_guidance_ctx") != decision_context:
+        st.session_state["guidance_info_fig"] = build_information_value_figure(
+            tuple(context["info_values"].items()))
+        st.session_state["guidance_confidence_fig"] = build_confidence_radar_figure(
+            tuple(context["confidence_components"].items()))
+        st.session_state["guidance_pyvis_html"] = reasoning_path_html(decision_context)
+        st.session_state["last_guidance_ctx"] = decision_context
     
     # Information value calculation
     st.write("#### Next Best Information")
     
-    if decision_context == "Loan Application Assessment":
-        info_values = {
-            "Industry Growth Forecast": 0.78,
-            "Customer Concentration Details": 0.65,
-            "Management Team Background": 0.52,
-            "Detailed Cash Flow Projections": 0.87,
-            "Competitor Performance Data": 0.41
-        }
-    elif decision_context == "Monitoring Phase Alert":
-        info_values = {
-            "Updated Financial Statements": 0.92,
-            "Recent Management Changes": 0.44,
-            "Industry News Events": 0.62,
-            "Customer Payment Patterns": 0.75,
-            "Market Share Trends": 0.38
-        }
-    else:  # Term Modification
-        info_values = {
-            "Cash Flow Timing Analysis": 0.85,
-            "Industry Seasonality Data": 0.73,
-            "Supply Chain Disruption Impact": 0.68,
-            "Updated Collateral Valuation": 0.47,
-            "Customer Contract Renewal Rates": 0.56
-        }
-    
     # Display information value visualization
-    info_value_fig = information_value_visualization(info_values)
-    st.plotly_chart(info_value_fig, use_container_width=True)
+    st.plotly_chart(st.session_state["guidance_info_fig"], use_container_width=True, theme=None, 
+                    config=CHART_CONFIG,
+                    key="guidance_info_value_chart")
     
     st.write("The system calculates which information would most reduce uncertainty, focusing the process on high-value information rather than following a generic checklist.")
     
-    # Reasoning path visualization
-    st.write("#### Decision Reasoning Path")
-    
-    if decision_context == "Loan Application Assessment":
-        reasoning_steps = [
-            ["Strong financial metrics", "Positive industry outlook", "Acceptable collateral value"],
-            ["Profitability meets threshold", "Debt service capacity confirmed", "Market position validation"]
-        ]
-        conclusion = "Approve with standard terms"
-        confidence = 0.76
-    elif decision_context == "Monitoring Phase Alert":
-        reasoning_steps = [
-            ["Delayed payments detected", "Industry downturn signals", "Competitive pressure increasing"],
-            ["Cash flow deterioration trend", "Risk level increasing"]
-        ]
-        conclusion = "Increase monitoring frequency"
-        confidence = 0.82
-    else:  # Term Modification
-        reasoning_steps = [
-            ["Seasonal cash flow pattern confirmed", "Strong historical payment performance", "Industry-wide timing shift"],
-            ["Payment timing misalignment", "Underlying business remains sound"]
-        ]
-        conclusion = "Approve payment schedule adjustment"
-        confidence = 0.68
-    
-    # Create and display reasoning path graph
-    G = create_reasoning_path_graph(reasoning_steps, conclusion)
-    create_pyvis_graph(G, height=400)
-    
-    st.write("""
-    The reasoning path shows how the system arrived at its recommendation,
-    building trust through transparency rather than asking users to trust a black box score.
-    """)
+    # Reasoning path visualization, embedded only when the user opens it
+    with st.expander("Decision Reasoning Path", expanded=False):
+        # Display the reasoning path graph from its precomputed HTML
+        components.html(st.session_state["guidance_pyvis_html"], height=400, scrolling=False)
+        
+        st.write("""
+        The reasoning path shows how the system arrived at its recommendation,
+        building trust through transparency rather than asking users to trust a black box score.
+        """)
     
     # Confidence components
     st.write("#### Recommendation Confidence Analysis")
     
-    if decision_context == "Loan Application Assessment":
-        confidence_components = {
-            "Financial Data Quality": 0.88,
-            "Industry Trend Clarity": 0.72,
-            "Market Position Certainty": 0.65,
-            "Management Assessment": 0.81,
-            "Collateral Valuation": 0.79
-        }
-    elif decision_context == "Monitoring Phase Alert":
-        confidence_components = {
-            "Payment Data Reliability": 0.95,
-            "Industry Trend Clarity": 0.82,
-            "Competitive Intelligence": 0.71,
-            "Financial Statement Recency": 0.88,
-            "Historical Pattern Matching": 0.75
-        }
-    else:  # Term Modification
-        confidence_components = {
-            "Cash Flow Analysis Quality": 0.84,
-            "Seasonality Pattern Clarity": 0.92,
-            "Payment History Completeness": 0.76,
-            "Market Condition Assessment": 0.62,
-            "Customer Relationship Stability": 0.69
-        }
-    
     # Display confidence component visualization
-    confidence_fig = confidence_breakdown_radar(confidence_components)
-    st.plotly_chart(confidence_fig, use_container_width=True)
+    st.plotly_chart(st.session_state["guidance_confidence_fig"], use_container_width=True, theme=None, 
+                    config=CHART_CONFIG,
+                    key="guidance_confidence_chart")
     
     # Final recommendation
     st.write("#### Final Recommendation")
     
-    if decision_context == "Loan Application Assessment":
-        recommendation_title = "Approve the loan application with standard terms"
-        recommendation_content = "Based on strong financial metrics, positive industry outlook, and acceptable collateral value, we recommend approving this loan with our standard terms and monitoring frequency."
-    elif decision_context == "Monitoring Phase Alert":
-        recommendation_title = "Increase monitoring frequency and request updated financials"
-        recommendation_content = "Recent payment delays combined with industry downturn signals suggest increased risk. We recommend increasing monitoring frequency from quarterly to monthly and requesting updated financial statements immediately."
-    else:  # Term Modification
-        recommendation_title = "Approve payment schedule adjustment"
-        recommendation_content = "The analysis confirms seasonal cash flow patterns typical for this industry. With the strong historical payment performance, we recommend approving the requested payment schedule adjustment to align with their business cycle."
-    
-    recommendation_card(recommendation_title, recommendation_content, confidence)
+    recommendation_card(context["recommendation_title"], context["recommendation_content"], 
+                        context["confidence"])
     
     # Counterfactual analysis
     st.write("#### What Would Change This Recommendation?")
     
-    if decision_context == "Loan Application Assessment":
-        st.write("""
-        The recommendation would change to "Approve with modified terms" if:
-        - Debt service coverage ratio fell below 1.2
-        - Industry outlook showed increased volatility
-        - Customer concentration exceeded 30% with a single client
-        
-        The recommendation would change to "Decline" if:
-        - Cash flow projections showed insufficient coverage
-        - Management team had recent significant turnover
-        - Collateral valuation decreased by more than 15%
-        """)
-    elif decision_context == "Monitoring Phase Alert":
-        st.write("""
-        The recommendation would change to "Initiate loss mitigation" if:
-        - Payment delays exceeded 60 days
-        - Updated financials showed negative EBITDA
-        - Major customer loss was reported
-        
-        The recommendation would change to "Return to normal monitoring" if:
-        - Payment pattern returned to consistent on-time payments
-        - Industry indicators stabilized
-        - Updated financials showed strong liquidity position
-        """)
-    else:  # Term Modification
-        st.write("""
-        The recommendation would change to "Approve with additional conditions" if:
-        - Seasonal pattern was less pronounced than reported
-        - Recent payment history showed occasional delays
-        - Industry peers were not experiencing similar timing issues
-        
-        The recommendation would change to "Decline modification" if:
-        - Cash flow analysis revealed fundamental shortfalls
-        - Customer concentration had increased significantly
-        - Management provided inconsistent explanation for timing issues
-        """)
-    
-    return decision_context
\ No newline at end of file
+    st.markdown(context["counterfactuals"])
\ No newline at end of file
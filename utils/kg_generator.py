@@ -1,7 +1,102 @@
 # utils/kg_generator.py
+import streamlit as st
 import networkx as nx
 import pandas as pd
 from utils.theme import COLORS
+from utils.demo_data import frame_records
+
+# Node and edge colors used by the graph builders, looked up once at import
+DIGITAL_TWIN_COLOR = COLORS['digital_twin']
+PRIMARY_COLOR = COLORS['primary']
+GUIDANCE_COLOR = COLORS['guidance']
+EXTERNAL_COLOR = COLORS['external']
+TEMPORAL_COLOR = COLORS['temporal']
+EDGE_DEFAULT_COLOR = COLORS['edge_default']
+LOW_CONFIDENCE_COLOR = COLORS['low_confidence']
+
+# Risk component scores shown as nodes: (risk data key, node label, node title)
+RISK_COMPONENT_LABELS = (
+    ("financial_health_score", "Financial Health", "Financial Health Score"),
+    ("management_risk_score", "Management Risk", "Management Risk Score"),
+    ("industry_risk_score", "Industry Risk", "Industry Risk Score"),
+    ("external_context_score", "External Risk", "External Context Risk Score")
+)
+
+# Nodes each risk component score is cross-connected to, when both are present
+RISK_COMPONENT_TARGETS = (
+    ("financial_health_score", "Financial Metrics"),
+    ("industry_risk_score", "External Context"),
+    ("management_risk_score", "Management")
+)
+
+# Number of stage graphs kept by build_stage_graph
+GRAPH_CACHE_SIZE = 32
+
+# Map journey stages to the month index of the data shown at that stage
+STAGE_TO_INDEX = {
+    "Initial Application": 0,
+    "Information Gathering": 2,
+    "Risk Assessment": 5,
+    "Decision Point": 8,
+    "Monitoring Phase": 11
+}
+
+def labelled(label):
+    """Return a (name, title) pair for a node whose title is its name, formatted once."""
+    return label, label
+
+# Group and detail nodes of the initial graph, as str.format patterns over the company profile:
+# group -> (group title, ((name pattern, title pattern), ...))
+SKELETON_GROUPS = {
+    "Basic Information": ("Basic Company Information", (
+        ("Industry: {industry}", "Industry: {industry}"),
+        ("Business Type: {business_type}", "Business Type: {business_type}"),
+        ("Years in Business: {years_in_business}", "Years in Business: {years_in_business}"),
+        ("Employees: {employees}", "Employees: {employees}"),
+        ("Location: {location}", "Location: {location}")
+    )),
+    "Loan Request": ("Loan Request Details", (
+        ("Amount: ${loan_amount_requested:,}", "Loan Amount: ${loan_amount_requested:,}"),
+        ("Purpose: {loan_purpose}", "Loan Purpose: {loan_purpose}"),
+        ("Term: {loan_term_requested} years", "Loan Term: {loan_term_requested} years"),
+        ("Collateral: {collateral_offered}", "Collateral: {collateral_offered}")
+    )),
+    "Credit History": ("Credit History", (
+        ("Credit Score: {credit_score}", "Credit Score: {credit_score}"),
+        ("Previous Loans: {previous_loans}", "Previous Loans: {previous_loans}"),
+        ("Loans Repaid: {previous_loans_repaid}", "Loans Repaid: {previous_loans_repaid}")
+    ))
+}
+
+# Company-specific node names and titles of the skeleton, as patterns
+SKELETON_PATTERNS = [("{name}", "{name}")] + [
+    detail for _, details in SKELETON_GROUPS.values() for detail in details
+]
+
+def build_skeleton_template():
+    """Build the initial graph once, with the name patterns standing in for company-specific nodes."""
+    company = "{name}"
+    
+    # Materialize the whole edge list and node attributes, then build the graph in two calls;
+    # each group's edge precedes its details, keeping the original node and edge order
+    edges = []
+    node_attrs = {company: {"size": 30, "color": DIGITAL_TWIN_COLOR}}
+    
+    for group, (group_title, details) in SKELETON_GROUPS.items():
+        edges.append((company, group, {"width": 2}))
+        node_attrs[group] = {"size": 20, "color": PRIMARY_COLOR, "title": group_title}
+        for name, _ in details:
+            edges.append((group, name, {"width": 1}))
+            node_attrs[name] = {"size": 15, "color": PRIMARY_COLOR}
+    
+    G = nx.Graph()
+    G.add_edges_from(edges)
+    nx.set_node_attributes(G, node_attrs)
+    
+    return G
+
+# Shared shape of every applicant's initial graph, copied and relabelled per company
+SKELETON_TEMPLATE = build_skeleton_template()
 
 def create_initial_knowledge_graph(company_profile):
     """
@@ -13,82 +108,17 @@ def create_initial_knowledge_graph(company_profile):
     Returns:
         NetworkX graph object representing the initial knowledge graph
     """
-    G = nx.Graph()
-    
-    # Add main company node
-    G.add_node(company_profile['name'], 
-               size=30, 
-               color=COLORS['digital_twin'], 
-               title=company_profile['name'])
-    
-    # Add basic info group
-    G.add_node("Basic Information", 
-               size=20, 
-               color=COLORS['primary'], 
-               title="Basic Company Information")
-    G.add_edge(company_profile['name'], "Basic Information", width=2)
-    
-    # Add basic company info nodes
-    basic_info = [
-        {"name": f"Industry: {company_profile['industry']}", 
-         "title": f"Industry: {company_profile['industry']}"},
-        {"name": f"Business Type: {company_profile['business_type']}", 
-         "title": f"Business Type: {company_profile['business_type']}"},
-        {"name": f"Years in Business: {company_profile['years_in_business']}", 
-         "title": f"Years in Business: {company_profile['years_in_business']}"},
-        {"name": f"Employees: {company_profile['employees']}", 
-         "title": f"Employees: {company_profile['employees']}"},
-        {"name": f"Location: {company_profile['location']}", 
-         "title": f"Location: {company_profile['location']}"}
-    ]
-    
-    for info in basic_info:
-        G.add_node(info["name"], size=15, color=COLORS['primary'], title=info["title"])
-        G.add_edge("Basic Information", info["name"], width=1)
-    
-    # Add loan request group
-    G.add_node("Loan Request", 
-               size=20, 
-               color=COLORS['primary'], 
-               title="Loan Request Details")
-    G.add_edge(company_profile['name'], "Loan Request", width=2)
-    
-    # Add loan request details
-    loan_info = [
-        {"name": f"Amount: ${company_profile['loan_amount_requested']:,}", 
-         "title": f"Loan Amount: ${company_profile['loan_amount_requested']:,}"},
-        {"name": f"Purpose: {company_profile['loan_purpose']}", 
-         "title": f"Loan Purpose: {company_profile['loan_purpose']}"},
-        {"name": f"Term: {company_profile['loan_term_requested']} years", 
-         "title": f"Loan Term: {company_profile['loan_term_requested']} years"},
-        {"name": f"Collateral: {company_profile['collateral_offered']}", 
-         "title": f"Collateral: {company_profile['collateral_offered']}"}
-    ]
-    
-    for info in loan_info:
-        G.add_node(info["name"], size=15, color=COLORS['primary'], title=info["title"])
-        G.add_edge("Loan Request", info["name"], width=1)
-    
-    # Add credit history group
-    G.add_node("Credit History", 
-               size=20, 
-               color=COLORS['primary'], 
-               title="Credit History")
-    G.add_edge(company_profile['name'], "Credit History", width=2)
-    
-    # Add credit history details
-    credit_info = [
-        {"name": f"Credit Score: {company_profile['credit_score']}", 
-         "title": f"Credit Score: {company_profile['credit_score']}"},
-        {"name": f"Previous Loans: {company_profile['previous_loans']}", 
-         "title": f"Previous Loans: {company_profile['previous_loans']}"},
-        {"name": f"Loans Repaid: {company_profile['previous_loans_repaid']}", 
-         "title": f"Loans Repaid: {company_profile['previous_loans_repaid']}"}
-    ]
-    
-    for info in credit_info:
-        G.add_node(info["name"], size=15, color=COLORS['primary'], title=info["title"])
-        G.add_edge("Credit History", info["name"], width=1)
+    # Fill in the company-specific names and titles of the shared skeleton
+    names = {}
+    titles = {}
+    for name_pattern, title_pattern in SKELETON_PATTERNS:
+        name = name_pattern.format(**company_profile)
+        names[name_pattern] = name
+        titles[name] = {"title": title_pattern.format(**company_profile)}
+    
+    # relabel_nodes copies the template in its original node and edge order
+    G = nx.relabel_nodes(SKELETON_TEMPLATE, names, copy=True)
+    nx.set_node_attributes(G, titles)
     
     return G
 
@@ -111,126 +141,101 @@ def create_expanded_knowledge_graph(company_profile, financial_data):
         if len(financial_data) > 0:
             financial_data = financial_data.iloc[0].to_dict()
     
+    # Collect new nodes and edges in insertion order, then add them in one batch each
+    nodes = []
+    edges = []
+    
     # Add financial metrics group
-    G.add_node("Financial Metrics", 
-               size=20, 
-               color=COLORS['primary'], 
-               title="Financial Metrics")
-    G.add_edge(company_profile['name'], "Financial Metrics", width=2)
+    nodes.append(("Financial Metrics", {"size": 20, "color": PRIMARY_COLOR, "title": "Financial Metrics"}))
+    edges.append((company_profile['name'], "Financial Metrics", {"width": 2}))
     
     # Add financial metrics
     financial_metrics = [
-        {"name": f"Revenue: ${financial_data.get('revenue', 0):,.0f}", 
-         "title": f"Revenue: ${financial_data.get('revenue', 0):,.0f}"},
-        {"name": f"Profit Margin: {financial_data.get('profit_margin', 0)*100:.1f}%", 
-         "title": f"Profit Margin: {financial_data.get('profit_margin', 0)*100:.1f}%"},
-        {"name": f"Cash Balance: ${financial_data.get('cash_balance', 0):,.0f}", 
-         "title": f"Cash Balance: ${financial_data.get('cash_balance', 0):,.0f}"},
-        {"name": f"Debt Ratio: {financial_data.get('debt_ratio', 0):.2f}", 
-         "title": f"Debt Ratio: {financial_data.get('debt_ratio', 0):.2f}"}
+        labelled(f"Revenue: ${financial_data.get('revenue', 0):,.0f}"),
+        labelled(f"Profit Margin: {financial_data.get('profit_margin', 0)*100:.1f}%"),
+        labelled(f"Cash Balance: ${financial_data.get('cash_balance', 0):,.0f}"),
+        labelled(f"Debt Ratio: {financial_data.get('debt_ratio', 0):.2f}")
     ]
     
-    for metric in financial_metrics:
-        G.add_node(metric["name"], size=15, color=COLORS['primary'], title=metric["title"])
-        G.add_edge("Financial Metrics", metric["name"], width=1)
+    nodes.extend((name, {"size": 15, "color": PRIMARY_COLOR, "title": title}) for name, title in financial_metrics)
+    edges.extend(("Financial Metrics", name, {"width": 1}) for name, _ in financial_metrics)
     
     # Add industry-specific metrics if available
     if company_profile['industry'] == "Software Development" and 'customer_acquisition_cost' in financial_data:
-        G.add_node("SaaS Metrics", 
-                   size=20, 
-                   color=COLORS['primary'], 
-                   title="SaaS Business Metrics")
-        G.add_edge(company_profile['name'], "SaaS Metrics", width=2)
+        nodes.append(("SaaS Metrics", {"size": 20, "color": PRIMARY_COLOR, "title": "SaaS Business Metrics"}))
+        edges.append((company_profile['name'], "SaaS Metrics", {"width": 2}))
         
         saas_metrics = [
-            {"name": f"CAC: ${financial_data.get('customer_acquisition_cost', 0):.0f}", 
-             "title": f"Customer Acquisition Cost: ${financial_data.get('customer_acquisition_cost', 0):.0f}"},
-            {"name": f"MRR: ${financial_data.get('monthly_recurring_revenue', 0):,.0f}", 
-             "title": f"Monthly Recurring Revenue: ${financial_data.get('monthly_recurring_revenue', 0):,.0f}"},
-            {"name": f"LTV: ${financial_data.get('customer_lifetime_value', 0):,.0f}", 
-             "title": f"Customer Lifetime Value: ${financial_data.get('customer_lifetime_value', 0):,.0f}"}
+            (f"CAC: ${financial_data.get('customer_acquisition_cost', 0):.0f}", 
+             f"Customer Acquisition Cost: ${financial_data.get('customer_acquisition_cost', 0):.0f}"),
+            (f"MRR: ${financial_data.get('monthly_recurring_revenue', 0):,.0f}", 
+             f"Monthly Recurring Revenue: ${financial_data.get('monthly_recurring_revenue', 0):,.0f}"),
+            (f"LTV: ${financial_data.get('customer_lifetime_value', 0):,.0f}", 
+             f"Customer Lifetime Value: ${financial_data.get('customer_lifetime_value', 0):,.0f}")
         ]
         
-        for metric in saas_metrics:
-            G.add_node(metric["name"], size=15, color=COLORS['primary'], title=metric["title"])
-            G.add_edge("SaaS Metrics", metric["name"], width=1)
+        nodes.extend((name, {"size": 15, "color": PRIMARY_COLOR, "title": title}) for name, title in saas_metrics)
+        edges.extend(("SaaS Metrics", name, {"width": 1}) for name, _ in saas_metrics)
     
     elif company_profile['industry'] == "Manufacturing" and 'raw_material_costs' in financial_data:
-        G.add_node("Manufacturing Metrics", 
-                   size=20, 
-                   color=COLORS['primary'], 
-                   title="Manufacturing Metrics")
-        G.add_edge(company_profile['name'], "Manufacturing Metrics", width=2)
+        nodes.append(("Manufacturing Metrics", {"size": 20, "color": PRIMARY_COLOR, "title": "Manufacturing Metrics"}))
+        edges.append((company_profile['name'], "Manufacturing Metrics", {"width": 2}))
         
         mfg_metrics = [
-            {"name": f"Material Costs: ${financial_data.get('raw_material_costs', 0):,.0f}", 
-             "title": f"Raw Material Costs: ${financial_data.get('raw_material_costs', 0):,.0f}"},
-            {"name": f"Capacity Utilization: {financial_data.get('capacity_utilization', 0)*100:.1f}%", 
-             "title": f"Capacity Utilization: {financial_data.get('capacity_utilization', 0)*100:.1f}%"},
-            {"name": f"Order Backlog: ${financial_data.get('order_backlog', 0):,.0f}", 
-             "title": f"Order Backlog: ${financial_data.get('order_backlog', 0):,.0f}"}
+            (f"Material Costs: ${financial_data.get('raw_material_costs', 0):,.0f}", 
+             f"Raw Material Costs: ${financial_data.get('raw_material_costs', 0):,.0f}"),
+            labelled(f"Capacity Utilization: {financial_data.get('capacity_utilization', 0)*100:.1f}%"),
+            labelled(f"Order Backlog: ${financial_data.get('order_backlog', 0):,.0f}")
         ]
         
-        for metric in mfg_metrics:
-            G.add_node(metric["name"], size=15, color=COLORS['primary'], title=metric["title"])
-            G.add_edge("Manufacturing Metrics", metric["name"], width=1)
+        nodes.extend((name, {"size": 15, "color": PRIMARY_COLOR, "title": title}) for name, title in mfg_metrics)
+        edges.extend(("Manufacturing Metrics", name, {"width": 1}) for name, _ in mfg_metrics)
     
     elif company_profile['industry'] == "Retail" and 'same_store_sales_growth' in financial_data:
-        G.add_node("Retail Metrics", 
-                   size=20, 
-                   color=COLORS['primary'], 
-                   title="Retail Metrics")
-        G.add_edge(company_profile['name'], "Retail Metrics", width=2)
+        nodes.append(("Retail Metrics", {"size": 20, "color": PRIMARY_COLOR, "title": "Retail Metrics"}))
+        edges.append((company_profile['name'], "Retail Metrics", {"width": 2}))
         
         retail_metrics = [
-            {"name": f"Same Store Sales Growth: {financial_data.get('same_store_sales_growth', 0)*100:.1f}%", 
-             "title": f"Same Store Sales Growth: {financial_data.get('same_store_sales_growth', 0)*100:.1f}%"},
-            {"name": f"Inventory Turnover: {financial_data.get('inventory_turnover', 0):.1f}x", 
-             "title": f"Inventory Turnover: {financial_data.get('inventory_turnover', 0):.1f}x"},
-            {"name": f"Customer Traffic: {financial_data.get('customer_traffic', 0):,.0f}", 
-             "title": f"Monthly Customer Traffic: {financial_data.get('customer_traffic', 0):,.0f}"}
+            labelled(f"Same Store Sales Growth: {financial_data.get('same_store_sales_growth', 0)*100:.1f}%"),
+            labelled(f"Inventory Turnover: {financial_data.get('inventory_turnover', 0):.1f}x"),
+            (f"Customer Traffic: {financial_data.get('customer_traffic', 0):,.0f}", 
+             f"Monthly Customer Traffic: {financial_data.get('customer_traffic', 0):,.0f}")
         ]
         
-        for metric in retail_metrics:
-            G.add_node(metric["name"], size=15, color=COLORS['primary'], title=metric["title"])
-            G.add_edge("Retail Metrics", metric["name"], width=1)
+        nodes.extend((name, {"size": 15, "color": PRIMARY_COLOR, "title": title}) for name, title in retail_metrics)
+        edges.extend(("Retail Metrics", name, {"width": 1}) for name, _ in retail_metrics)
     
     # Add management information
-    G.add_node("Management", 
-               size=20, 
-               color=COLORS['primary'], 
-               title="Management Information")
-    G.add_edge(company_profile['name'], "Management", width=2)
+    nodes.append(("Management", {"size": 20, "color": PRIMARY_COLOR, "title": "Management Information"}))
+    edges.append((company_profile['name'], "Management", {"width": 2}))
     
     management_info = [
-        {"name": f"Team Size: {company_profile.get('management_team_size', 'Unknown')}", 
-         "title": f"Management Team Size: {company_profile.get('management_team_size', 'Unknown')}"},
-        {"name": f"Experience: {company_profile.get('management_experience_years', 'Unknown')} years", 
-         "title": f"Average Experience: {company_profile.get('management_experience_years', 'Unknown')} years"}
+        (f"Team Size: {company_profile.get('management_team_size', 'Unknown')}", 
+         f"Management Team Size: {company_profile.get('management_team_size', 'Unknown')}"),
+        (f"Experience: {company_profile.get('management_experience_years', 'Unknown')} years", 
+         f"Average Experience: {company_profile.get('management_experience_years', 'Unknown')} years")
     ]
     
-    for info in management_info:
-        G.add_node(info["name"], size=15, color=COLORS['primary'], title=info["title"])
-        G.add_edge("Management", info["name"], width=1)
+    nodes.extend((name, {"size": 15, "color": PRIMARY_COLOR, "title": title}) for name, title in management_info)
+    edges.extend(("Management", name, {"width": 1}) for name, _ in management_info)
     
     # Add customer information if available
     if 'customer_count' in company_profile and company_profile['customer_count'] != "General public":
-        G.add_node("Customers", 
-                  size=20, 
-                  color=COLORS['primary'], 
-                  title="Customer Information")
-        G.add_edge(company_profile['name'], "Customers", width=2)
+        nodes.append(("Customers", {"size": 20, "color": PRIMARY_COLOR, "title": "Customer Information"}))
+        edges.append((company_profile['name'], "Customers", {"width": 2}))
         
         customer_info = [
-            {"name": f"Count: {company_profile.get('customer_count', 'Unknown')}", 
-             "title": f"Customer Count: {company_profile.get('customer_count', 'Unknown')}"},
-            {"name": f"Concentration: {company_profile.get('largest_customer_percentage', 'Unknown')}%", 
-             "title": f"Largest Customer: {company_profile.get('largest_customer_percentage', 'Unknown')}% of revenue"}
+            (f"Count: {company_profile.get('customer_count', 'Unknown')}", 
+             f"Customer Count: {company_profile.get('customer_count', 'Unknown')}"),
+            (f"Concentration: {company_profile.get('largest_customer_percentage', 'Unknown')}%", 
+             f"Largest Customer: {company_profile.get('largest_customer_percentage', 'Unknown')}% of revenue")
         ]
         
-        for info in customer_info:
-            G.add_node(info["name"], size=15, color=COLORS['primary'], title=info["title"])
-            G.add_edge("Customers", info["name"], width=1)
+        nodes.extend((name, {"size": 15, "color": PRIMARY_COLOR, "title": title}) for name, title in customer_info)
+        edges.extend(("Customers", name, {"width": 1}) for name, _ in customer_info)
+    
+    G.add_nodes_from(nodes)
+    G.add_edges_from(edges)
     
     return G
 
@@ -254,203 +259,147 @@ def create_comprehensive_knowledge_graph(company_profile, financial_data, risk_d
     if isinstance(risk_data, pd.DataFrame) and len(risk_data) > 0:
         risk_data = risk_data.iloc[0].to_dict()
     
+    # Collect new nodes and edges in insertion order, then add them in one batch each
+    nodes = []
+    edges = []
+    
     # Add risk assessment group
-    G.add_node("Risk Assessment", 
-               size=20, 
-               color=COLORS['guidance'], 
-               title="Risk Assessment")
-    G.add_edge(company_profile['name'], "Risk Assessment", width=2)
+    nodes.append(("Risk Assessment", {"size": 20, "color": GUIDANCE_COLOR, "title": "Risk Assessment"}))
+    edges.append((company_profile['name'], "Risk Assessment", {"width": 2}))
     
     # Add risk metrics
     risk_metrics = [
-        {"name": f"Risk Score: {risk_data.get('risk_score', 0):.2f}", 
-         "title": f"Overall Risk Score: {risk_data.get('risk_score', 0):.2f}"},
-        {"name": f"Confidence: {risk_data.get('confidence_score', 0):.2f}", 
-         "title": f"Confidence Score: {risk_data.get('confidence_score', 0):.2f}"}
+        (f"Risk Score: {risk_data.get('risk_score', 0):.2f}", 
+         f"Overall Risk Score: {risk_data.get('risk_score', 0):.2f}"),
+        (f"Confidence: {risk_data.get('confidence_score', 0):.2f}", 
+         f"Confidence Score: {risk_data.get('confidence_score', 0):.2f}")
     ]
     
-    # Add component scores if available
-    if 'financial_health_score' in risk_data:
-        risk_metrics.append({
-            "name": f"Financial Health: {risk_data.get('financial_health_score', 0):.2f}", 
-            "title": f"Financial Health Score: {risk_data.get('financial_health_score', 0):.2f}"
-        })
-    
-    if 'management_risk_score' in risk_data:
-        risk_metrics.append({
-            "name": f"Management Risk: {risk_data.get('management_risk_score', 0):.2f}", 
-            "title": f"Management Risk Score: {risk_data.get('management_risk_score', 0):.2f}"
-        })
-    
-    if 'industry_risk_score' in risk_data:
-        risk_metrics.append({
-            "name": f"Industry Risk: {risk_data.get('industry_risk_score', 0):.2f}", 
-            "title": f"Industry Risk Score: {risk_data.get('industry_risk_score', 0):.2f}"
-        })
-    
-    if 'external_context_score' in risk_data:
-        risk_metrics.append({
-            "name": f"External Risk: {risk_data.get('external_context_score', 0):.2f}", 
-            "title": f"External Context Risk Score: {risk_data.get('external_context_score', 0):.2f}"
-        })
-    
-    for metric in risk_metrics:
-        G.add_node(metric["name"], size=15, color=COLORS['guidance'], title=metric["title"])
-        G.add_edge("Risk Assessment", metric["name"], width=1)
+    # Add component scores if available, remembering node names for the cross-connections
+    component_nodes = {}
+    for score_key, label, title in RISK_COMPONENT_LABELS:
+        if score_key in risk_data:
+            score = f"{risk_data.get(score_key, 0):.2f}"
+            component_nodes[score_key] = f"{label}: {score}"
+            risk_metrics.append((component_nodes[score_key], f"{title}: {score}"))
+    
+    nodes.extend((name, {"size": 15, "color": GUIDANCE_COLOR, "title": title}) for name, title in risk_metrics)
+    edges.extend(("Risk Assessment", name, {"width": 1}) for name, _ in risk_metrics)
     
     # Add external context if provided
     if external_context:
-        G.add_node("External Context", 
-                   size=20, 
-                   color=COLORS['external'], 
-                   title="External Context")
-        G.add_edge(company_profile['name'], "External Context", width=2)
+        nodes.append(("External Context", {"size": 20, "color": EXTERNAL_COLOR, "title": "External Context"}))
+        edges.append((company_profile['name'], "External Context", {"width": 2}))
         
         # Add active context sources
         for source_name, source_data in external_context.items():
             if source_data.get("active", False):
                 # Add the context source node
                 source_node_name = f"{source_name}"
-                G.add_node(source_node_name, 
-                           size=15, 
-                           color=COLORS['external'], 
-                           title=f"{source_name} (Reliability: {source_data.get('reliability', 0):.2f})")
-                G.add_edge("External Context", source_node_name, width=1)
+                nodes.append((source_node_name, {
+                    "size": 15, 
+                    "color": EXTERNAL_COLOR, 
+                    "title": f"{source_name} (Reliability: {source_data.get('reliability', 0):.2f})"
+                }))
+                edges.append(("External Context", source_node_name, {"width": 1}))
                 
                 # Add source details if sources are available
                 if "sources" in source_data:
                     for i, src in enumerate(source_data["sources"]):
                         if i < 2:  # Limit to 2 sources per category to avoid overloading
                             source_detail_name = f"{src.get('name', 'Source')}"
-                            G.add_node(source_detail_name, 
-                                       size=10, 
-                                       color=COLORS['external'], 
-                                       title=f"{src.get('content', src.get('name', 'Source'))}")
-                            G.add_edge(source_node_name, source_detail_name, width=1)
+                            nodes.append((source_detail_name, {
+                                "size": 10, 
+                                "color": EXTERNAL_COLOR, 
+                                "title": f"{src.get('content', src.get('name', 'Source'))}"
+                            }))
+                            edges.append((source_node_name, source_detail_name, {"width": 1}))
     
     # Add temporal intelligence layer if we have multiple time points of data
     if isinstance(financial_data, pd.DataFrame) and len(financial_data) > 1:
-        G.add_node("Temporal Intelligence", 
-                   size=20, 
-                   color=COLORS['temporal'], 
-                   title="Temporal Intelligence")
-        G.add_edge(company_profile['name'], "Temporal Intelligence", width=2)
+        nodes.append(("Temporal Intelligence", {"size": 20, "color": TEMPORAL_COLOR, "title": "Temporal Intelligence"}))
+        edges.append((company_profile['name'], "Temporal Intelligence", {"width": 2}))
         
         # Add trend nodes based on industry
         if company_profile['industry'] == "Software Development":
             trends = [
-                {"name": "Growth Trend", 
-                 "title": "Consistent revenue growth pattern"},
-                {"name": "Margin Stability", 
-                 "title": "Stable profit margins over time"},
-                {"name": "Increasing LTV/CAC Ratio", 
-                 "title": "Improving unit economics"}
+                ("Growth Trend", 
+                 "Consistent revenue growth pattern"),
+                ("Margin Stability", 
+                 "Stable profit margins over time"),
+                ("Increasing LTV/CAC Ratio", 
+                 "Improving unit economics")
             ]
         elif company_profile['industry'] == "Manufacturing":
             trends = [
-                {"name": "Capacity Utilization Trend", 
-                 "title": "Changing factory utilization over time"},
-                {"name": "Material Cost Pressure", 
-                 "title": "Rising raw material costs"},
-                {"name": "Order Backlog Evolution", 
-                 "title": "Changing order pipeline"}
+                ("Capacity Utilization Trend", 
+                 "Changing factory utilization over time"),
+                ("Material Cost Pressure", 
+                 "Rising raw material costs"),
+                ("Order Backlog Evolution", 
+                 "Changing order pipeline")
             ]
         elif company_profile['industry'] == "Retail":
             trends = [
-                {"name": "Store Traffic Decline", 
-                 "title": "Decreasing customer visits over time"},
-                {"name": "Margin Compression", 
-                 "title": "Decreasing profit margins"},
-                {"name": "Inventory Turnover Slowdown", 
-                 "title": "Slowing inventory movement"}
+                ("Store Traffic Decline", 
+                 "Decreasing customer visits over time"),
+                ("Margin Compression", 
+                 "Decreasing profit margins"),
+                ("Inventory Turnover Slowdown", 
+                 "Slowing inventory movement")
             ]
         else:
             trends = [
-                {"name": "Revenue Trend", 
-                 "title": "Revenue change over time"},
-                {"name": "Margin Trend", 
-                 "title": "Profit margin evolution"},
-                {"name": "Cash Flow Pattern", 
-                 "title": "Cash flow stability over time"}
+                ("Revenue Trend", 
+                 "Revenue change over time"),
+                ("Margin Trend", 
+                 "Profit margin evolution"),
+                ("Cash Flow Pattern", 
+                 "Cash flow stability over time")
             ]
         
-        for trend in trends:
-            G.add_node(trend["name"], size=15, color=COLORS['temporal'], title=trend["title"])
-            G.add_edge("Temporal Intelligence", trend["name"], width=1)
+        nodes.extend((name, {"size": 15, "color": TEMPORAL_COLOR, "title": title}) for name, title in trends)
+        edges.extend(("Temporal Intelligence", name, {"width": 1}) for name, _ in trends)
     
-    # Add cross-connections to show relationships between nodes
-    # Connect risk scores to relevant data
-    if "Financial Health: " in G.nodes:
-        relevant_nodes = [n for n in G.nodes if "Financial Metrics" in n]
-        if relevant_nodes:
-            G.add_edge("Financial Health: " + str(risk_data.get('financial_health_score', 0)), 
-                      "Financial Metrics", width=1, color=COLORS['edge_default'])
+    G.add_nodes_from(nodes)
+    G.add_edges_from(edges)
     
-    if "Industry Risk: " in G.nodes and "External Context" in G.nodes:
-        G.add_edge("Industry Risk: " + str(risk_data.get('industry_risk_score', 0)), 
-                  "External Context", width=1, color=COLORS['edge_default'])
-    
-    if "Management Risk: " in G.nodes and "Management" in G.nodes:
-        G.add_edge("Management Risk: " + str(risk_data.get('management_risk_score', 0)), 
-                  "Management", width=1, color=COLORS['edge_default'])
+    # Add cross-connections to show relationships between nodes
+    # Connect risk scores to relevant data, by exact node name
+    for score_key, target in RISK_COMPONENT_TARGETS:
+        if score_key in component_nodes and target in G:
+            G.add_edge(component_nodes[score_key], target, width=1, color=EDGE_DEFAULT_COLOR)
     
     # Connect relevant external context to financial metrics
     if "External Context" in G.nodes and "Financial Metrics" in G.nodes:
-        G.add_edge("External Context", "Financial Metrics", width=1, color=COLORS['edge_default'])
+        G.add_edge("External Context", "Financial Metrics", width=1, color=EDGE_DEFAULT_COLOR)
     
     # Connect temporal intelligence to financial metrics
     if "Temporal Intelligence" in G.nodes and "Financial Metrics" in G.nodes:
-        G.add_edge("Temporal Intelligence", "Financial Metrics", width=1, color=COLORS['edge_default'])
+        G.add_edge("Temporal Intelligence", "Financial Metrics", width=1, color=EDGE_DEFAULT_COLOR)
     
     return G
 
-def get_graph_for_stage(applicant_data, journey_stage, stage_to_index=None):
+@st.cache_data(max_entries=GRAPH_CACHE_SIZE, show_spinner=False)
+def build_stage_graph(journey_stage, company_profile, financial_record=None, 
+                      risk_record=None, external_context=None):
     """
-    Get the appropriate knowledge graph for a specific journey stage.
+    Build the knowledge graph for one journey stage from plain data.
     
-    Args:
-        applicant_data: Dictionary containing all applicant data
-        journey_stage: String indicating the current journey stage
-        stage_to_index: Dictionary mapping stages to data indices (optional)
-        
-    Returns:
-        NetworkX graph object for the specified stage
+    Results are cached on the content of the arguments, so regenerated data is
+    never served a stale graph, and every caller receives its own copy.
     """
-    company_profile = applicant_data["company_profile"]
-    financial_data = applicant_data["financial_data"]
-    risk_scores = applicant_data["risk_scores"]
-    external_context = applicant_data.get("external_context", None)
-    
-    # Default stage to index mapping if not provided
-    if stage_to_index is None:
-        stage_to_index = {
-            "Initial Application": 0,
-            "Information Gathering": 2,
-            "Risk Assessment": 5,
-            "Decision Point": 8,
-            "Monitoring Phase": 11
-        }
-    
-    # Get the appropriate index for the current stage
-    current_index = stage_to_index.get(journey_stage, 0)
-    
-    # Create graph based on journey stage
     if journey_stage == "Initial Application":
         return create_initial_knowledge_graph(company_profile)
     
     elif journey_stage == "Information Gathering":
-        return create_expanded_knowledge_graph(company_profile, financial_data.iloc[current_index])
+        return create_expanded_knowledge_graph(company_profile, financial_record)
     
     else:  # Risk Assessment, Decision Point, or Monitoring
         return create_comprehensive_knowledge_graph(
-            company_profile, 
-            financial_data.iloc[current_index], 
-            risk_scores.iloc[current_index], 
-            external_context
+            company_profile, financial_record, risk_record, external_context
         )
 
-# In utils/kg_generator.py
-
 def get_graph_for_stage(applicant_data, journey_stage, stage_to_index=None):
     """
     Get the appropriate knowledge graph for a specific journey stage.
@@ -471,13 +420,7 @@ def get_graph_for_stage(applicant_data, journey_stage, stage_to_index=None):
         
         # Default stage to index mapping if not provided
         if stage_to_index is None:
-            stage_to_index = {
-                "Initial Application": 0,
-                "Information Gathering": 2,
-                "Risk Assessment": 5,
-                "Decision Point": 8,
-                "Monitoring Phase": 11
-            }
+            stage_to_index = STAGE_TO_INDEX
         
         # Get the appropriate index for the current stage
         current_index = stage_to_index.get(journey_stage, 0)
@@ -487,18 +430,31 @@ def get_graph_for_stage(applicant_data, journey_stage, stage_to_index=None):
             current_index = len(financial_data) - 1
             print(f"Warning: Adjusted current_index to {current_index}")
         
-        # Create graph based on journey stage
+        # Index the row dicts precomputed by the loader, converting the tables only when absent
+        financial_records = applicant_data.get("financial_records")
+        if financial_records is None:
+            financial_records = frame_records(financial_data)
+        risk_records = applicant_data.get("risk_records")
+        if risk_records is None:
+            risk_records = frame_records(risk_scores)
+        
+        # Pass each builder only the data it uses, so the cache key covers exactly that
         if journey_stage == "Initial Application":
-            return create_initial_knowledge_graph(company_profile)
+            return build_stage_graph(journey_stage, company_profile)
         
         elif journey_stage == "Information Gathering":
-            return create_expanded_knowledge_graph(company_profile, financial_data.iloc[current_index])
+            return build_stage_graph(
+                journey_stage, 
+                company_profile, 
+                financial_records[current_index]
+            )
         
         else:  # Risk Assessment, Decision Point, or Monitoring
-            return create_comprehensive_knowledge_graph(
+            return build_stage_graph(
+                journey_stage, 
                 company_profile, 
-                financial_data.iloc[current_index], 
-                risk_scores.iloc[current_index], 
+                financial_records[current_index], 
+                risk_records[current_index], 
                 external_context
             )
     except Exception as e:
@@ -508,6 +464,6 @@ def get_graph_for_stage(applicant_data, journey_stage, stage_to_index=None):
         
         # Return a simple fallback graph
         G = nx.Graph()
-        G.add_node("Error", size=25, color=COLORS['low_confidence'], 
+        G.add_node("Error", size=25, color=LOW_CONFIDENCE_COLOR, 
                    title=f"Error generating graph: {str(e)}")
         return G
\ No newline at end of file
@@ -3,9 +3,8 @@ import streamlit as st
 import networkx as nx
 from pyvis.network import Network
 import streamlit.components.v1 as components
-import tempfile
-import os
 from utils.theme import COLORS
+from utils.graph_viz import compute_static_layout
 
 def interactive_knowledge_graph(G, height=500, width=None, physics=True, 
                               bgcolor=COLORS['bg_dark'], font_color=COLORS['text_primary'],
@@ -33,21 +32,33 @@ def interactive_knowledge_graph(G, height=500, width=None, physics=True,
     net = Network(height=f"{height}px", width=width, notebook=False, 
                  bgcolor=bgcolor, font_color=font_color)
     
-    # Add nodes with properties
-    for node, node_attrs in G.nodes(data=True):
-        size = node_attrs.get('size', 25)
-        title = node_attrs.get('title', str(node))
-        color = node_attrs.get('color', COLORS['node_default'])
-        shape = node_attrs.get('shape', 'dot')
+    # Without physics, place nodes at positions computed once on the server
+    pos = None
+    if not physics:
+        pos = compute_static_layout(tuple(str(node) for node in G.nodes()),
+                                    tuple((str(source), str(target)) for source, target in G.edges()))
+    
+    # Add nodes with properties, reading each attribute through a bulk accessor
+    for (node, size), (_, title), (_, color), (_, shape) in zip(
+            G.nodes(data='size', default=25),
+            G.nodes(data='title'),
+            G.nodes(data='color', default=COLORS['node_default']),
+            G.nodes(data='shape', default='dot')):
+        if title is None:
+            title = str(node)
         
-        net.add_node(str(node), title=title, color=color, size=size, shape=shape, label=str(node))
+        if pos is None:
+            net.add_node(str(node), title=title, color=color, size=size, shape=shape, label=str(node))
+        else:
+            x, y = pos[str(node)]
+            net.add_node(str(node), title=title, color=color, size=size, shape=shape, label=str(node),
+                         x=x, y=y, physics=False)
     
     # Add edges with properties
-    for source, target, edge_attrs in G.edges(data=True):
-        width = edge_attrs.get('width', 1)
-        color = edge_attrs.get('color', COLORS['edge_default'])
-        title = edge_attrs.get('title', '')
-        
+    for (source, target, width), (_, _, color), (_, _, title) in zip(
+            G.edges(data='width', default=1),
+            G.edges(data='color', default=COLORS['edge_default']),
+            G.edges(data='title', default='')):
         net.add_edge(str(source), str(target), width=width, color=color, title=title)
     
     # Configure physics
@@ -94,20 +105,8 @@ def interactive_knowledge_graph(G, height=500, width=None, physics=True,
     }
     """)
     
-    # Generate HTML file
-    with tempfile.NamedTemporaryFile(delete=False, suffix='.html') as temp:
-        path = temp.name
-        net.save_graph(path)
-    
-    # Read HTML content
-    with open(path, 'r', encoding='utf-8') as f:
-        html = f.read()
-    
-    # Clean up the temporary file
-    try:
-        os.unlink(path)
-    except:
-        pass
+    # Generate the HTML in memory
+    html = net.generate_html(notebook=False)
     
     # Display the interactive graph
     return components.html(html, height=height, width=width)
@@ -2,19 +2,22 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
+import zlib
 import plotly.express as px
 import plotly.graph_objects as go
 from utils.theme import COLORS
-import random
 
+@st.cache_data(max_entries=32)
 def create_single_signal(name, data=None, points=100, amplitude=0.5, 
                          frequency=0.1, noise=0.05, phase=0):
     """Create a single signal visualization."""
     if data is None:
-        # Generate synthetic data if not provided
+        # Generate synthetic data if not provided, seeded by the signal name so each
+        # cached figure is stable but differs from the other signals
+        rng = np.random.default_rng(zlib.crc32(name.encode("utf-8")))
         x = np.linspace(0, 10, points)
         y = amplitude * np.sin(frequency * x * np.pi + phase)
-        y += np.random.normal(0, noise, points)
+        y += rng.normal(0, noise, points)
         data = pd.DataFrame({'x': x, 'y': y})
     
     # Create figure
@@ -45,27 +48,29 @@ def create_single_signal(name, data=None, points=100, amplitude=0.5,
     
     return fig
 
+@st.cache_data(max_entries=32)
 def create_combined_signal(signals, base_amplitudes=None, points=100):
     """Create a visualization of combined signals."""
     if not signals:
         return None, 0
     
+    # Seeded generator so the same selection always produces the same signal
+    rng = np.random.default_rng(42)
+    n_signals = len(signals)
+    
     if base_amplitudes is None:
         # Generate random but consistent amplitudes
-        random.seed(42)
-        base_amplitudes = {name: random.uniform(0.2, 0.5) for name in signals}
+        amplitudes = rng.uniform(0.2, 0.5, n_signals)
+    else:
+        amplitudes = np.array([base_amplitudes.get(name, 0.3) for name in signals])
     
-    x = np.linspace(0, 10, points)
-    combined_y = np.zeros(points)
+    frequencies = rng.uniform(0.05, 0.2, n_signals)
+    phases = rng.uniform(0, 2*np.pi, n_signals)
     
-    # Add each signal
-    for name in signals:
-        amplitude = base_amplitudes.get(name, 0.3)
-        frequency = random.uniform(0.05, 0.2)
-        phase = random.uniform(0, 2*np.pi)
-        
-        component = amplitude * np.sin(frequency * x * np.pi + phase)
-        combined_y += component
+    # Sum all signal components at once: one row per signal, one column per point
+    x = np.linspace(0, 10, points)
+    components = amplitudes[:, None] * np.sin(frequencies[:, None] * x[None, :] * np.pi + phases[:, None])
+    combined_y = components.sum(axis=0)
     
     # Scale combined signal
     max_val = max(1.0, np.max(np.abs(combined_y)))
@@ -164,4 +164,23 @@ def layer_badge(layer_name):
                 border-radius: 15px; color: white; font-size: 0.8em; margin-right: 10px;">
         {layer_name}
     </div>
-    """, unsafe_allow_html=True)
\ No newline at end of file
+    """, unsafe_allow_html=True)
+
+@st.cache_resource
+def dark_layout_template():
+    """Return the shared dark-theme Plotly template used by the app's charts."""
+    import plotly.graph_objects as go
+    
+    # Plotly copies templates when they are assigned to a figure, so sharing is safe
+    return go.layout.Template(layout=dict(
+        paper_bgcolor=COLORS['bg_dark'],
+        plot_bgcolor=COLORS['bg_dark'],
+        font_color=COLORS['text_primary'],
+        xaxis=dict(gridcolor=COLORS['bg_light']),
+        yaxis=dict(gridcolor=COLORS['bg_light']),
+        polar=dict(
+            bgcolor=COLORS['bg_dark'],
+            radialaxis=dict(gridcolor=COLORS['bg_light']),
+            angularaxis=dict(gridcolor=COLORS['bg_light'])
+        )
+    ))